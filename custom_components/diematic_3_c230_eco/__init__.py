@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from diematic_client import DiematicParseError
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     CONF_HOST,
@@ -11,10 +13,28 @@ from homeassistant.const import (
     Platform,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
+from homeassistant.helpers.event import async_track_time_interval
 
 from . import schedule
-from .const import DOMAIN
-from .diematic_bolier import DiematicBoiler
+from .const import (
+    CONF_LIMIT_PER_HOST,
+    CONF_PUSH,
+    CONF_REGISTER_MAP,
+    CONF_TRANSPORT,
+    CONF_UNIT,
+    CONF_WRITE_RATE,
+    DEFAULT_LIMIT_PER_HOST,
+    DEFAULT_PUSH,
+    DEFAULT_UNIT,
+    DEFAULT_WRITE_RATE,
+    DOMAIN,
+    TRANSPORT_HTTP,
+    TRANSPORT_MODBUS,
+)
+from .diematic_bolier import CATALOG_REFRESH_INTERVAL, DiematicBoiler
+from .modbus import load_register_map
+from .storage import DiematicStore
 
 PLATFORMS = [
     Platform.BINARY_SENSOR,
@@ -27,29 +47,80 @@ PLATFORMS = [
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Diematic from a config entry."""
     hass.data.setdefault(DOMAIN, {})
+    transport = entry.data.get(CONF_TRANSPORT, TRANSPORT_HTTP)
     if not (diematic_boiler := hass.data[DOMAIN].get(entry.entry_id)):
+        registers = None
+        if transport == TRANSPORT_MODBUS:
+            try:
+                registers = await hass.async_add_executor_job(
+                    load_register_map, entry.data[CONF_REGISTER_MAP]
+                )
+            except (OSError, HomeAssistantError, DiematicParseError) as error:
+                raise ConfigEntryNotReady(
+                    f"Cannot read register map {entry.data[CONF_REGISTER_MAP]}: {error}"
+                ) from error
+
         # Create IPP instance for this entry
         diematic_boiler = DiematicBoiler(
             hass,
             host=entry.data[CONF_HOST],
             port=entry.data[CONF_PORT],
-            tls=entry.data[CONF_SSL],
-            verify_ssl=entry.data[CONF_VERIFY_SSL],
+            tls=entry.data.get(CONF_SSL, False),
+            verify_ssl=entry.data.get(CONF_VERIFY_SSL, False),
+            limit_per_host=entry.options.get(
+                CONF_LIMIT_PER_HOST, DEFAULT_LIMIT_PER_HOST
+            ),
+            entry_id=entry.entry_id,
+            write_rate=entry.options.get(CONF_WRITE_RATE, DEFAULT_WRITE_RATE),
+            transport=transport,
+            unit=entry.data.get(CONF_UNIT, DEFAULT_UNIT),
+            registers=registers,
         )
         hass.data[DOMAIN][entry.entry_id] = diematic_boiler
 
-    await diematic_boiler.coordinator.async_config_entry_first_refresh()
+    if await diematic_boiler.async_restore():
+        # Entities start from the saved snapshot while the boiler is read
+        hass.async_create_background_task(
+            diematic_boiler.coordinator.async_refresh(),
+            f"{DOMAIN} {entry.entry_id} refresh",
+        )
+    else:
+        await diematic_boiler.coordinator.async_config_entry_first_refresh()
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    await schedule.async_setup(hass)
+    await schedule.async_setup_entry(hass, entry)
+
+    # Only the daemon publishes an event stream
+    if transport == TRANSPORT_HTTP and entry.options.get(CONF_PUSH, DEFAULT_PUSH):
+        diematic_boiler.stream.async_start()
+
+    # Registers added to or removed from the descriptor update the entities in place
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass, diematic_boiler.async_refresh_catalog, CATALOG_REFRESH_INTERVAL
+        )
+    )
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        await schedule.async_unload_entry(hass, entry)
+        diematic_boiler: DiematicBoiler = hass.data[DOMAIN].pop(entry.entry_id)
+        diematic_boiler.async_shutdown()
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the saved snapshot of a deleted config entry."""
+    await DiematicStore(hass, entry.entry_id).async_remove()
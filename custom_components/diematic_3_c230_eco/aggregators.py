@@ -0,0 +1,213 @@
+"""Metrics derived from the boiler variables, updated as the snapshots arrive."""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, field, fields
+from datetime import date, datetime
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+
+@dataclass
+class OnTime:
+    """Running time and starts of an on/off variable."""
+
+    total_s: float = 0.0
+    today_s: float = 0.0
+    yesterday_s: float | None = None
+    starts: int = 0
+    day: str | None = None
+    # Last observation, not saved: the time the boiler was not read is unknown
+    on: bool | None = field(default=None, metadata={"saved": False})
+    since: datetime | None = field(default=None, metadata={"saved": False})
+
+    def update(self, value: Any, now: datetime) -> None:
+        """Add the time elapsed since the last observation if the variable was on."""
+        midnight = dt_util.start_of_local_day(now)
+        if self.on and self.since is not None:
+            self.total_s += (now - self.since).total_seconds()
+            if self.since < midnight:
+                self.today_s += (midnight - self.since).total_seconds()
+                self._roll(now)
+                self.today_s = (now - midnight).total_seconds()
+            else:
+                self.today_s += (now - self.since).total_seconds()
+        if self.day != now.date().isoformat():
+            self._roll(now)
+
+        on = bool(value)
+        if on and self.on is False:
+            self.starts += 1
+        self.on = on
+        self.since = now
+
+    def duty_cycle(self, now: datetime) -> float:
+        """Return the share of today the variable has been on."""
+        elapsed = (now - dt_util.start_of_local_day(now)).total_seconds()
+        return min(self.today_s / elapsed, 1.0) if elapsed > 0 else 0.0
+
+    def _roll(self, now: datetime) -> None:
+        """Start a new day, keeping the runtime of the previous one."""
+        if self.day is not None:
+            yesterday = date.fromordinal(now.date().toordinal() - 1).isoformat()
+            self.yesterday_s = self.today_s if self.day == yesterday else 0.0
+        self.today_s = 0.0
+        self.day = now.date().isoformat()
+
+
+@dataclass
+class DailyStatistics:
+    """Minimum, maximum and time weighted mean of a variable over the current day."""
+
+    minimum: float | None = None
+    maximum: float | None = None
+    weighted_sum: float = 0.0
+    weighted_s: float = 0.0
+    yesterday: dict[str, float | None] | None = None
+    day: str | None = None
+    last: float | None = field(default=None, metadata={"saved": False})
+    since: datetime | None = field(default=None, metadata={"saved": False})
+
+    @property
+    def mean(self) -> float | None:
+        """Return the time weighted mean of today, the last value before any weight."""
+        if self.weighted_s > 0:
+            return self.weighted_sum / self.weighted_s
+        return self.last
+
+    def update(self, value: Any, now: datetime) -> None:
+        """Weight the previous value by the time it lasted and add the new one."""
+        if self.last is not None and self.since is not None:
+            midnight = dt_util.start_of_local_day(now)
+            if self.since < midnight:
+                self._weigh((midnight - self.since).total_seconds())
+                self._roll(now)
+                self._weigh((now - midnight).total_seconds())
+            else:
+                self._weigh((now - self.since).total_seconds())
+        if self.day != now.date().isoformat():
+            self._roll(now)
+
+        if value is None:
+            self.last = self.since = None
+            return
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            # Skip the sample, the last value keeps counting until the next one
+            if self.last is not None:
+                self.since = now
+            return
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        self.last = value
+        self.since = now
+
+    def _weigh(self, elapsed: float) -> None:
+        """Add the last value, lasting elapsed seconds, to the mean."""
+        self.weighted_sum += self.last * elapsed
+        self.weighted_s += elapsed
+
+    def _roll(self, now: datetime) -> None:
+        """Start a new day, keeping the statistics of the previous one."""
+        if self.day is not None:
+            yesterday = date.fromordinal(now.date().toordinal() - 1).isoformat()
+            self.yesterday = (
+                {"minimum": self.minimum, "maximum": self.maximum, "mean": self.mean}
+                if self.day == yesterday
+                else None
+            )
+        self.minimum = self.maximum = self.last
+        self.weighted_sum = self.weighted_s = 0.0
+        self.day = now.date().isoformat()
+
+
+def _saved(aggregator: OnTime | DailyStatistics) -> dict[str, Any]:
+    """Return the fields of an aggregator that are saved."""
+    data = asdict(aggregator)
+    for item in fields(aggregator):
+        if item.metadata.get("saved") is False:
+            del data[item.name]
+    return data
+
+
+class BoilerAggregates:
+    """Aggregators of the variables entities asked for, O(1) per update and variable."""
+
+    def __init__(self) -> None:
+        """Initialize without aggregators."""
+        self.on_times: dict[str, OnTime] = {}
+        self.statistics: dict[str, DailyStatistics] = {}
+        self._restored: dict[str, dict[str, Any]] = {"on_times": {}, "statistics": {}}
+        # Entities using each aggregator, released aggregators stop being tracked
+        self._users: Counter[tuple[str, str]] = Counter()
+
+    @property
+    def variables(self) -> set[str]:
+        """Return the variables that must be read to keep the aggregators going."""
+        return set(self.on_times) | set(self.statistics)
+
+    def on_time(self, variable: str) -> OnTime:
+        """Return the on time of a variable, tracking it from now on."""
+        self._users["on_times", variable] += 1
+        if (on_time := self.on_times.get(variable)) is None:
+            saved = self._restored["on_times"].pop(variable, {})
+            on_time = self.on_times[variable] = OnTime(**saved)
+        return on_time
+
+    def release_on_time(self, variable: str) -> None:
+        """Stop tracking the on time of a variable once no entity uses it."""
+        self._release("on_times", self.on_times, variable)
+
+    def daily_statistics(self, variable: str) -> DailyStatistics:
+        """Return the daily statistics of a variable, tracking it from now on."""
+        self._users["statistics", variable] += 1
+        if (statistics := self.statistics.get(variable)) is None:
+            saved = self._restored["statistics"].pop(variable, {})
+            statistics = self.statistics[variable] = DailyStatistics(**saved)
+        return statistics
+
+    def release_daily_statistics(self, variable: str) -> None:
+        """Stop tracking the daily statistics of a variable once no entity uses it."""
+        self._release("statistics", self.statistics, variable)
+
+    def update(self, variables: Mapping[str, Any], now: datetime) -> None:
+        """Feed the aggregators with a new snapshot."""
+        for variable, on_time in self.on_times.items():
+            if (value := variables.get(variable)) is not None:
+                on_time.update(value, now)
+        for variable, statistics in self.statistics.items():
+            statistics.update(variables.get(variable), now)
+
+    def restore(self, data: Mapping[str, Any]) -> None:
+        """Use the saved state for the aggregators created from now on."""
+        self._restored = {
+            "on_times": dict(data.get("on_times", {})),
+            "statistics": dict(data.get("statistics", {})),
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state to save, including the aggregators not tracked now."""
+        return {
+            "on_times": self._restored["on_times"]
+            | {name: _saved(on_time) for name, on_time in self.on_times.items()},
+            "statistics": self._restored["statistics"]
+            | {name: _saved(stats) for name, stats in self.statistics.items()},
+        }
+
+    def _release(
+        self,
+        kind: str,
+        aggregators: dict[str, OnTime] | dict[str, DailyStatistics],
+        variable: str,
+    ) -> None:
+        """Drop an aggregator nobody uses, keeping its saved state for later."""
+        self._users[kind, variable] -= 1
+        if self._users[kind, variable] > 0:
+            return
+        del self._users[kind, variable]
+        if (aggregator := aggregators.pop(variable, None)) is not None:
+            self._restored[kind][variable] = _saved(aggregator)
@@ -9,7 +9,8 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
 from .diematic_bolier import DiematicBoiler
-from .entity import DiematicEntity
+from .entity import DiematicEntity, async_setup_catalog_entities
+from .register_catalog import RegisterCatalog
 
 
 async def async_setup_entry(
@@ -21,30 +22,8 @@ async def async_setup_entry(
     if (unique_id := entry.unique_id) is None:
         unique_id = entry.unique_id
 
-    config = await diematic_boiler.boiler_config()
-
-    bitstypes = [
-        bit
-        for sub in config
-        if "type" in list(sub) and "bits" in list(sub) and sub["type"] == "bits"
-        for bit in sub["bits"]
-    ]
-
     sensors: list[BinarySensorEntity] = []
 
-    sensors.extend(
-        DiematicBoilerBinarySensor(
-            entry_id=entry.entry_id,
-            unique_id=unique_id,
-            diematic_boiler=diematic_boiler,
-            variable=f"io_circ_{circuit}_pump_on",
-            name=f"Pump circuit {circuit}",
-            icon="mdi:pump",
-        )
-        for circuit in ("a", "b", "c")
-        if f"monday_{circuit}_0000_0030" in bitstypes
-    )
-
     sensors.append(
         DiematicBoilerBinarySensor(
             entry_id=entry.entry_id,
@@ -90,7 +69,26 @@ async def async_setup_entry(
         )
     )
 
-    async_add_entities(sensors, True)
+    async_add_entities(sensors)
+
+    def circuit_pumps(catalog: RegisterCatalog) -> list[BinarySensorEntity]:
+        """Return a pump sensor per circuit the boiler has."""
+        return [
+            DiematicBoilerBinarySensor(
+                entry_id=entry.entry_id,
+                unique_id=unique_id,
+                diematic_boiler=diematic_boiler,
+                variable=f"io_circ_{circuit}_pump_on",
+                name=f"Pump circuit {circuit}",
+                icon="mdi:pump",
+            )
+            for circuit in ("a", "b", "c")
+            if catalog.has_schedule(circuit, "monday")
+        ]
+
+    await async_setup_catalog_entities(
+        hass, entry, diematic_boiler, async_add_entities, circuit_pumps
+    )
 
 
 class DiematicBoilerBinarySensor(DiematicEntity, BinarySensorEntity):
@@ -117,6 +115,7 @@ class DiematicBoilerBinarySensor(DiematicEntity, BinarySensorEntity):
             name=name,
             icon=icon,
             enabled_default=enabled_default,
+            variables=(variable,),
         )
 
     @property
@@ -0,0 +1,212 @@
+"""Diematic HTTP client with the requests used by this integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass
+import hashlib
+import json
+import logging
+from socket import gaierror as SocketGIAError
+import time
+from typing import Any
+
+import aiohttp
+import async_timeout
+from diematic_client import (
+    Boiler,
+    DiematicBoilerClient,
+    DiematicConnectionError,
+    DiematicParseError,
+    DiematicResponseError,
+)
+from diematic_client.enums import DiematicOperation
+from yarl import URL
+
+from .metrics import RequestStats
+
+try:
+    import msgpack
+except ImportError:  # Optional, the daemon answers JSON to clients without it
+    msgpack = None
+
+SLOW_REQUEST_MS = 2000
+MSGPACK_CONTENT_TYPES = ("application/msgpack", "application/x-msgpack")
+# Daemons able to send the compact encoding use it, the others keep sending JSON
+ACCEPT = (
+    "application/msgpack, application/json;q=0.9, text/plain;q=0.8, */*;q=0.5"
+    if msgpack is not None
+    else "application/json, text/plain, */*"
+)
+# Read only requests whose response is reused while the daemon reports no change
+CACHEABLE_OPERATIONS = {DiematicOperation.GET_VALUES, DiematicOperation.GET_CONFIG}
+# Partial reads of different variables are cached apart, keep the latest ones
+MAX_CACHED_RESPONSES = 8
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    """Validators and parsed result of the last response to a request."""
+
+    etag: str | None
+    digest: bytes
+    result: Any
+
+
+class DiematicClient(DiematicBoilerClient):
+    """Extension of the boiler client talking to the diematic daemon."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the client and its request statistics."""
+        super().__init__(*args, **kwargs)
+        self.stats = RequestStats()
+        self._responses: dict[str, CachedResponse] = {}
+        self._boiler: tuple[Any, Boiler] | None = None
+
+    async def boiler(self) -> Boiler:
+        """Get the boiler values, the same Boiler while the daemon reports no change."""
+        response_data = await self.execute(DiematicOperation.GET_VALUES, {})
+        if self._boiler is not None and self._boiler[0] is response_data:
+            return self._boiler[1]
+
+        try:
+            boiler = Boiler.from_dict(response_data)
+        except Exception as exc:
+            raise DiematicParseError from exc
+        self._boiler = (response_data, boiler)
+        return boiler
+
+    async def boiler_variables(self, names: Iterable[str]) -> dict[str, Any]:
+        """Get only the named variables, daemons ignoring the filter return all of them."""
+        response_data = await self._request(
+            self._message(DiematicOperation.GET_VALUES, {}),
+            params={"names": ",".join(sorted(names))},
+        )
+        if not isinstance(response_data, dict):
+            raise DiematicParseError("Unexpected boiler variables response")
+
+        return {key: value for key, value in response_data.items() if key != "uuid"}
+
+    async def _request(self, data: dict, params: dict | None = None) -> Any:
+        """Handle a request to the daemon, recording its latency and payload size."""
+        url = URL(self.diematic_uri).join(URL(data["uri"]))
+        auth = None
+        if self.username and self.password:
+            auth = aiohttp.BasicAuth(self.username, self.password)
+        headers = {
+            "User-Agent": self.user_agent,
+            "Accept": ACCEPT,
+            "Accept-Encoding": "gzip, deflate",
+            "Cache-Control": "max-age=0",
+        }
+        cache_key = None
+        cached = None
+        if data["operation"] in CACHEABLE_OPERATIONS:
+            cache_key = str(url.update_query(params) if params else url)
+            cached = self._responses.get(cache_key)
+            if cached is not None and cached.etag is not None:
+                headers["If-None-Match"] = cached.etag
+
+        queued = time.perf_counter()
+        async with self.session_sem:
+            start = time.perf_counter()
+            size = 0
+            error = True
+            unchanged = False
+            try:
+                async with async_timeout.timeout(self.request_timeout):
+                    async with self._session.request(
+                        data["method"],
+                        url,
+                        auth=auth,
+                        data=data["data"],
+                        params=params,
+                        headers=headers,
+                        ssl=self.verify_ssl,
+                    ) as response:
+                        content = await response.read()
+                # Compressed responses are counted by their size on the wire
+                size = response.content_length or len(content)
+
+                if response.status == 304 and cached is not None:
+                    unchanged = True
+                    error = False
+                    return cached.result
+
+                if (response.status // 100) in [4, 5]:
+                    raise DiematicResponseError(
+                        f"HTTP {response.status}",
+                        {
+                            "content-type": response.headers.get("Content-Type"),
+                            "message": content.decode("utf-8", "replace"),
+                            "status-code": response.status,
+                        },
+                    )
+
+                # Daemons without ETag support are detected by a content hash
+                digest = hashlib.blake2b(content, digest_size=16).digest()
+                content_type = response.headers.get("Content-Type", "")
+                if cached is not None and cached.digest == digest:
+                    unchanged = True
+                    result = cached.result
+                elif content_type.startswith("application/json"):
+                    result = json.loads(content)
+                elif msgpack is not None and content_type.startswith(
+                    MSGPACK_CONTENT_TYPES
+                ):
+                    result = msgpack.unpackb(content)
+                else:
+                    result = content.decode("utf-8")
+                if cache_key is not None:
+                    self._responses.pop(cache_key, None)
+                    self._responses[cache_key] = CachedResponse(
+                        response.headers.get("ETag"), digest, result
+                    )
+                    if len(self._responses) > MAX_CACHED_RESPONSES:
+                        del self._responses[next(iter(self._responses))]
+                error = False
+                return result
+            except asyncio.TimeoutError as exc:
+                raise DiematicConnectionError(
+                    "Timeout occurred while connecting to Diematic server."
+                ) from exc
+            except (aiohttp.ClientError, SocketGIAError) as exc:
+                raise DiematicConnectionError(
+                    "Error occurred while communicating with Diematic server."
+                ) from exc
+            except ValueError as exc:
+                raise DiematicParseError(
+                    "Invalid payload from Diematic server."
+                ) from exc
+            finally:
+                end = time.perf_counter()
+                latency_ms = (end - start) * 1000
+                self.stats.record(
+                    _operation(data),
+                    data["uri"],
+                    latency_ms,
+                    (start - queued) * 1000,
+                    size,
+                    error,
+                    unchanged,
+                )
+                if latency_ms > SLOW_REQUEST_MS:
+                    _LOGGER.debug(
+                        "Slow %s request to %s took %.0f ms",
+                        data["method"],
+                        data["uri"],
+                        latency_ms,
+                    )
+
+
+def _operation(data: dict) -> str:
+    """Return the statistics name of a request message."""
+    return {
+        DiematicOperation.GET_VALUES: "boiler",
+        DiematicOperation.GET_CONFIG: "config",
+        DiematicOperation.GET_VALUE: "read_boiler_register",
+        DiematicOperation.SET_VALUE: "update_boiler_register",
+    }.get(data["operation"], "other")
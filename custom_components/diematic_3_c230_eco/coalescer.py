@@ -0,0 +1,26 @@
+"""Coalescing of the concurrent reads sent to the diematic daemon."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+_T = TypeVar("_T")
+
+
+class SingleFlight(Generic[_T]):
+    """Share one in-flight call between the concurrent callers using the same key."""
+
+    def __init__(self) -> None:
+        """Initialize the in-flight calls."""
+        self._inflight: dict[Hashable, asyncio.Future[_T]] = {}
+
+    async def async_call(self, key: Hashable, func: Callable[[], Awaitable[_T]]) -> _T:
+        """Run func, or join the call already running for key."""
+        if (future := self._inflight.get(key)) is None:
+            future = asyncio.ensure_future(func())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # A cancelled caller must not cancel the request shared with the others
+        return await asyncio.shield(future)
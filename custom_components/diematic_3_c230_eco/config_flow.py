@@ -13,13 +13,31 @@ from diematic_client import (
 )
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow
+from homeassistant.config_entries import ConfigEntry, ConfigFlow, OptionsFlow
 from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SSL, CONF_VERIFY_SSL
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import CONF_UUID, DOMAIN
+from .const import (
+    CONF_LIMIT_PER_HOST,
+    CONF_PUSH,
+    CONF_REGISTER_MAP,
+    CONF_TRANSPORT,
+    CONF_UNIT,
+    CONF_UUID,
+    CONF_WRITE_RATE,
+    DEFAULT_LIMIT_PER_HOST,
+    DEFAULT_MODBUS_PORT,
+    DEFAULT_PUSH,
+    DEFAULT_UNIT,
+    DEFAULT_WRITE_RATE,
+    DOMAIN,
+    TRANSPORT_HTTP,
+    TRANSPORT_MODBUS,
+)
+from .modbus import ModbusBoilerClient, load_register_map
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -40,6 +58,29 @@ async def validate_input(hass: HomeAssistant, data: dict) -> dict[str, Any]:
     return {CONF_UUID: boiler.info.uuid}
 
 
+async def validate_modbus_input(hass: HomeAssistant, data: dict) -> dict[str, Any]:
+    """Validate the register map and read one register through the gateway."""
+    registers = await hass.async_add_executor_job(
+        load_register_map, data[CONF_REGISTER_MAP]
+    )
+    client = ModbusBoilerClient(
+        host=data[CONF_HOST],
+        port=data[CONF_PORT],
+        unit=data[CONF_UNIT],
+        registers=registers,
+        uuid=f"modbus-{data[CONF_HOST]}-{data[CONF_PORT]}-{data[CONF_UNIT]}",
+    )
+    try:
+        named = [register["name"] for register in registers if "name" in register]
+        if not named:
+            raise DiematicParseError("The register map has no named registers")
+        await client.read_boiler_register(named[0])
+    finally:
+        client.close()
+
+    return {CONF_UUID: client.uuid}
+
+
 class DiematicFlowHandler(ConfigFlow, domain=DOMAIN):
     """Handle a Diematic config flow."""
 
@@ -49,10 +90,24 @@ class DiematicFlowHandler(ConfigFlow, domain=DOMAIN):
         """Set up the instance."""
         self.discovery_info = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return DiematicOptionsFlowHandler(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle a flow initiated by the user."""
+        return self.async_show_menu(
+            step_id="user", menu_options=[TRANSPORT_HTTP, TRANSPORT_MODBUS]
+        )
+
+    async def async_step_http(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle a boiler reached through the diematic daemon."""
         if user_input is None:
             return self._show_setup_form()
 
@@ -69,16 +124,43 @@ class DiematicFlowHandler(ConfigFlow, domain=DOMAIN):
         #     return self.async_abort(reason="diematic_error")
 
         unique_id = user_input[CONF_UUID] = info[CONF_UUID]
+        user_input[CONF_TRANSPORT] = TRANSPORT_HTTP
 
         await self.async_set_unique_id(unique_id)
         self._abort_if_unique_id_configured(updates={CONF_HOST: user_input[CONF_HOST]})
 
         return self.async_create_entry(title=user_input[CONF_HOST], data=user_input)
 
+    async def async_step_modbus(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle a boiler reached through a Modbus RTU over TCP gateway."""
+        if user_input is None:
+            return self._show_modbus_form()
+
+        try:
+            info = await validate_modbus_input(self.hass, user_input)
+        except (OSError, HomeAssistantError, DiematicParseError):
+            _LOGGER.debug("Diematic register map error", exc_info=True)
+            return self._show_modbus_form({"base": "invalid_register_map"})
+        except (DiematicConnectionError, DiematicResponseError):
+            _LOGGER.debug("Diematic Modbus Connection/Response Error", exc_info=True)
+            return self._show_modbus_form({"base": "cannot_connect"})
+
+        unique_id = user_input[CONF_UUID] = info[CONF_UUID]
+        user_input[CONF_TRANSPORT] = TRANSPORT_MODBUS
+
+        await self.async_set_unique_id(unique_id)
+        self._abort_if_unique_id_configured(
+            updates={CONF_REGISTER_MAP: user_input[CONF_REGISTER_MAP]}
+        )
+
+        return self.async_create_entry(title=user_input[CONF_HOST], data=user_input)
+
     def _show_setup_form(self, errors: dict | None = None) -> FlowResult:
         """Show the setup form to the user."""
         return self.async_show_form(
-            step_id="user",
+            step_id="http",
             data_schema=vol.Schema(
                 {
                     vol.Required(
@@ -103,3 +185,59 @@ class DiematicFlowHandler(ConfigFlow, domain=DOMAIN):
             ),
             errors=errors or {},
         )
+
+    def _show_modbus_form(self, errors: dict | None = None) -> FlowResult:
+        """Show the Modbus gateway form to the user."""
+        return self.async_show_form(
+            step_id="modbus",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_HOST): str,
+                    vol.Required(CONF_PORT, default=DEFAULT_MODBUS_PORT): int,
+                    vol.Required(CONF_UNIT, default=DEFAULT_UNIT): vol.All(
+                        int, vol.Range(min=1, max=247)
+                    ),
+                    vol.Required(CONF_REGISTER_MAP): str,
+                }
+            ),
+            errors=errors or {},
+        )
+
+
+class DiematicOptionsFlowHandler(OptionsFlow):
+    """Handle Diematic options."""
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        """Initialize options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_LIMIT_PER_HOST,
+                        default=self.config_entry.options.get(
+                            CONF_LIMIT_PER_HOST, DEFAULT_LIMIT_PER_HOST
+                        ),
+                    ): vol.All(int, vol.Range(min=1, max=10)),
+                    vol.Required(
+                        CONF_PUSH,
+                        default=self.config_entry.options.get(CONF_PUSH, DEFAULT_PUSH),
+                    ): bool,
+                    vol.Required(
+                        CONF_WRITE_RATE,
+                        default=self.config_entry.options.get(
+                            CONF_WRITE_RATE, DEFAULT_WRITE_RATE
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=20)),
+                }
+            ),
+        )
@@ -7,6 +7,39 @@ LOGGER = logging.getLogger(__package__)
 
 # Config Keys
 CONF_BASE_PATH = "base_path"
+CONF_LIMIT_PER_HOST = "limit_per_host"
+CONF_PUSH = "push"
+CONF_REGISTER_MAP = "register_map"
 CONF_SERIAL = "serial"
 CONF_TLS = "tls"
+CONF_TRANSPORT = "transport"
+CONF_UNIT = "unit"
 CONF_UUID = "uuid"
+CONF_WRITE_RATE = "write_rate"
+
+# Defaults
+DEFAULT_LIMIT_PER_HOST = 2
+DEFAULT_MODBUS_PORT = 502
+DEFAULT_PUSH = False
+DEFAULT_UNIT = 10
+DEFAULT_WRITE_RATE = 4.0
+
+# Transports
+TRANSPORT_HTTP = "http"
+TRANSPORT_MODBUS = "modbus"
+
+# Sent with the new RegisterCatalog of an entry, formatted with the entry id
+SIGNAL_CATALOG_UPDATED = f"{DOMAIN}_catalog_updated_{{}}"
+
+# Boiler layout
+CIRCUITS = ("a", "b", "c", "acs")
+DAYS_OF_WEEK = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+TEMPERATURE_UNITS = ("CelsiusTemperature", "°C", "K")
@@ -2,29 +2,81 @@
 
 from __future__ import annotations
 
+from collections import ChainMap
+from collections.abc import Callable, Mapping
 from datetime import timedelta
 import logging
+import time
+from typing import TYPE_CHECKING, Any
 
-from diematic_client import Boiler, DiematicBoilerClient, DiematicError
+from diematic_client import Boiler
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
+from .aggregators import BoilerAggregates
 from .const import DOMAIN
+from .schedule_engine import is_slot_name
+from .snapshot import BoilerSnapshot, SnapshotLayout
+from .write_confirmation import WriteConfirmations
+
+if TYPE_CHECKING:
+    from .diematic_bolier import DiematicBoiler
 
 SCAN_INTERVAL = timedelta(seconds=60)
+FAST_SCAN_INTERVAL = timedelta(seconds=10)
+MAX_SCAN_INTERVAL = timedelta(minutes=5)
+MAX_ERROR_INTERVAL = timedelta(minutes=10)
+IDLE_BACKOFF_FACTOR = 2
+
+# The fast tier is read on every poll, the other tiers once their interval elapsed
+TIER_FAST = "fast"
+TIER_MEDIUM = "medium"
+TIER_SLOW = "slow"
+TIER_INTERVALS = {
+    TIER_FAST: timedelta(seconds=20),
+    TIER_MEDIUM: SCAN_INTERVAL,
+    TIER_SLOW: timedelta(minutes=15),
+}
+TIER_DUE_MARGIN = timedelta(seconds=1)
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def tier_of(variable: str) -> str:
+    """Return the polling tier of a boiler variable."""
+    if variable == "error" or variable.startswith("io_"):
+        return TIER_FAST
+    if is_slot_name(variable):
+        return TIER_SLOW
+    return TIER_MEDIUM
+
+
 class DiematicCoordinator(DataUpdateCoordinator[Boiler]):
     """Class to manage fetching Boiler data from single endpoint."""
 
-    def __init__(
-        self, hass: HomeAssistant, boiler_client: DiematicBoilerClient
-    ) -> None:
+    def __init__(self, hass: HomeAssistant, diematic_boiler: DiematicBoiler) -> None:
         """Initialize global Boiler data updater."""
-        self.boiler_client = boiler_client
+        self.diematic_boiler = diematic_boiler
+        self.write_confirmations = WriteConfirmations(hass, self)
+        self._failures = 0
+        self._variable_listeners: dict[str, set[CALLBACK_TYPE]] = {}
+        self._notified_success: bool | None = None
+        self.push_active = False
+        # True while data comes from the snapshot saved by a previous run
+        self.stale = False
+        self._tier_due = {TIER_MEDIUM: 0.0, TIER_SLOW: 0.0}
+        # Whether the daemon honours the variable filter, None until a poll tells
+        self.partial_reads: bool | None = None
+        self._layout: SnapshotLayout | None = None
+        # Boiler read from the daemon that current data was built from
+        self._source: Boiler | None = None
+        # Values being written, shown until the boiler confirms or rejects them
+        self.optimistic: dict[str, Any] = {}
+        # Keys changed by the last update, None when every listener must run
+        self.changed_keys: set[str] | None = None
+        self.aggregates = BoilerAggregates()
 
         super().__init__(
             hass,
@@ -36,6 +88,229 @@ class DiematicCoordinator(DataUpdateCoordinator[Boiler]):
     async def _async_update_data(self) -> Boiler:
         """Fetch data from server."""
         try:
-            return await self.boiler_client.boiler()
-        except DiematicError as error:
-            raise UpdateFailed(f"Invalid response from API: {error}") from error
+            boiler = await self._async_fetch()
+        except UpdateFailed:
+            self._failures += 1
+            self.update_interval = min(
+                SCAN_INTERVAL * 2**self._failures, MAX_ERROR_INTERVAL
+            )
+            raise
+
+        self._failures = 0
+        self.write_confirmations.async_process_variables(boiler.variables)
+        self.aggregates.update(boiler.variables, dt_util.now())
+        # Every entity drops the assumed state of a saved snapshot
+        changed_keys = None if self.stale else self._changed_keys(boiler.variables)
+        self.update_interval = self._next_interval(changed_keys)
+        self.changed_keys = changed_keys
+        self.stale = False
+        self.diematic_boiler.async_schedule_save()
+        return boiler
+
+    async def _async_fetch(self) -> Boiler:
+        """Fetch the due tiers, limited to the variables of entities and aggregates."""
+        now = time.monotonic()
+        needed = set(self._variable_listeners) | self.aggregates.variables
+        if (
+            self.data is None
+            or not needed
+            or self.partial_reads is False
+            or now >= self._tier_due[TIER_SLOW]
+        ):
+            await self.diematic_boiler.hub.async_poll_turn(self)
+            boiler = await self.diematic_boiler.boiler()
+            for tier in self._tier_due:
+                self._tier_due[tier] = now + TIER_INTERVALS[tier].total_seconds()
+            return self.snapshot(boiler)
+
+        due = {TIER_FAST}
+        if now + TIER_DUE_MARGIN.total_seconds() >= self._tier_due[TIER_MEDIUM]:
+            due.add(TIER_MEDIUM)
+            self._tier_due[TIER_MEDIUM] = now + TIER_INTERVALS[TIER_MEDIUM].total_seconds()
+
+        names = {variable for variable in needed if tier_of(variable) in due}
+        names.update(self.write_confirmations.parameters)
+        if not names:
+            return self.data
+
+        await self.diematic_boiler.hub.async_poll_turn(self)
+        variables = await self.diematic_boiler.boiler_variables(names)
+        if self.partial_reads is None:
+            # Daemons ignoring the filter answer with every variable
+            self.partial_reads = variables.keys() <= names
+            if not self.partial_reads:
+                _LOGGER.debug("Daemon ignores the variable filter, polling it whole")
+        return self.merged(variables)
+
+    def snapshot(self, boiler: Boiler) -> Boiler:
+        """Return the boiler with its variables stored as a compact snapshot."""
+        variables = boiler.variables
+        if isinstance(variables, BoilerSnapshot):
+            return boiler
+        # The client returns the same Boiler while the daemon reports no change
+        if boiler is self._source and self.data is not None:
+            return self.data
+        if self._layout is None or not self._layout.covers(variables):
+            self._layout = SnapshotLayout(variables)
+        self._source = boiler
+        return Boiler(
+            info=boiler.info,
+            variables=BoilerSnapshot.from_variables(self._layout, variables),
+        )
+
+    def merged(self, variables: Mapping[str, Any]) -> Boiler:
+        """Return the current boiler with some variables replaced."""
+        self._source = None
+        return Boiler(
+            info=self.data.info, variables=self.data.variables.merge(variables)
+        )
+
+    @callback
+    def async_set_updated_data(self, data: Boiler) -> None:
+        """Manually update data, notifying only the listeners of changed keys."""
+        data = self.snapshot(data)
+        # Every entity drops the assumed state of a saved snapshot
+        self.changed_keys = None if self.stale else self._changed_keys(data.variables)
+        self.stale = False
+        self.write_confirmations.async_process_variables(data.variables)
+        self.aggregates.update(data.variables, dt_util.now())
+        super().async_set_updated_data(data)
+        self.diematic_boiler.async_schedule_save()
+
+    @property
+    def variables(self) -> Mapping[str, Any]:
+        """Return the boiler variables with the values being written on top."""
+        if self.optimistic:
+            return ChainMap(self.optimistic, self.data.variables)
+        return self.data.variables
+
+    @callback
+    def async_set_optimistic(self, values: Mapping[str, Any]) -> None:
+        """Show values being written before the boiler reports them."""
+        self.optimistic.update(values)
+        self.changed_keys = set(values)
+        self.async_update_listeners()
+
+    @callback
+    def async_clear_optimistic(self, values: Mapping[str, Any]) -> None:
+        """Go back to the boiler values, unless a newer value is being written."""
+        cleared = {
+            name
+            for name, value in values.items()
+            if name in self.optimistic and self.optimistic[name] == value
+        }
+        if not cleared:
+            return
+        for name in cleared:
+            del self.optimistic[name]
+        self.changed_keys = cleared
+        self.async_update_listeners()
+
+    @callback
+    def async_restore(self, data: Boiler) -> None:
+        """Use a saved snapshot as data until the boiler is read."""
+        self.data = self.snapshot(data)
+        self._source = None
+        self.stale = True
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates, indexed by variable when context lists them."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        if not isinstance(context, (set, frozenset)):
+            return remove_listener
+
+        for variable in context:
+            self._variable_listeners.setdefault(variable, set()).add(remove_listener)
+
+        @callback
+        def remove_variable_listener() -> None:
+            """Remove the listener and its variable subscriptions."""
+            for variable in context:
+                listeners = self._variable_listeners.get(variable)
+                if listeners is not None:
+                    listeners.discard(remove_listener)
+                    if not listeners:
+                        del self._variable_listeners[variable]
+            remove_listener()
+
+        return remove_variable_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners subscribed to the changed variables."""
+        if (
+            self.changed_keys is None
+            or self._notified_success != self.last_update_success
+        ):
+            self._notified_success = self.last_update_success
+            super().async_update_listeners()
+            return
+
+        to_notify: set[CALLBACK_TYPE] = set()
+        for variable in self.changed_keys:
+            to_notify.update(self._variable_listeners.get(variable, ()))
+        for remove_listener, (update_callback, context) in list(
+            self._listeners.items()
+        ):
+            if remove_listener in to_notify or not isinstance(
+                context, (set, frozenset)
+            ):
+                update_callback()
+
+    @callback
+    def async_set_push_active(self, active: bool) -> None:
+        """Relax polling while the daemon pushes updates, restore it otherwise."""
+        if active == self.push_active:
+            return
+        self.push_active = active
+        self.update_interval = MAX_SCAN_INTERVAL if active else self._base_interval
+        if self._listeners:
+            self._schedule_refresh()
+
+    def _changed_keys(self, variables: Mapping[str, Any]) -> set[str] | None:
+        """Return the variables whose value differs from the current data."""
+        if self.data is None:
+            return None
+        previous = self.data.variables
+        if variables is previous:
+            return set()
+        if isinstance(variables, BoilerSnapshot) and isinstance(
+            previous, BoilerSnapshot
+        ):
+            if (changed_keys := variables.changed_keys(previous)) is not None:
+                return changed_keys
+        changed = {key for key in variables if previous.get(key) != variables[key]}
+        changed.update(key for key in previous if key not in variables)
+        return changed
+
+    def _next_interval(self, changed_keys: set[str] | None) -> timedelta:
+        """Choose the delay until next poll from what changed since the last one."""
+        if self.write_confirmations.pending:
+            return FAST_SCAN_INTERVAL
+
+        # Pushed updates keep the data fresh, polling is only a safety net
+        if self.push_active:
+            return MAX_SCAN_INTERVAL
+
+        if changed_keys is None:
+            return self._base_interval
+
+        if any(key.startswith("io_") and "_pump" in key for key in changed_keys):
+            return FAST_SCAN_INTERVAL
+
+        if not changed_keys:
+            if self.update_interval < self._base_interval:
+                return self._base_interval
+            return min(self.update_interval * IDLE_BACKOFF_FACTOR, MAX_SCAN_INTERVAL)
+
+        return self._base_interval
+
+    @property
+    def _base_interval(self) -> timedelta:
+        """Return the poll interval, the fast tier one once partial reads work."""
+        if self.partial_reads:
+            return TIER_INTERVALS[TIER_FAST]
+        return SCAN_INTERVAL
@@ -0,0 +1,45 @@
+"""Diagnostics support for the De Dietrich C-230 integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .diematic_bolier import DiematicBoiler
+
+TO_REDACT = {CONF_HOST}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    diematic_boiler: DiematicBoiler = hass.data[DOMAIN][entry.entry_id]
+    coordinator = diematic_boiler.coordinator
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None,
+            "push_active": coordinator.push_active,
+            "pending_writes": sorted(diematic_boiler.write_confirmations.parameters),
+        },
+        "hub": {
+            "boilers": diematic_boiler.hub.boilers,
+            "limit": diematic_boiler.hub.limit,
+        },
+        "requests": diematic_boiler.stats.as_dict(),
+        "write_queue": diematic_boiler.write_queue.as_dict(),
+        "aggregates": coordinator.aggregates.as_dict(),
+    }
@@ -1,10 +1,37 @@
 """Representation of a Diematic boiler."""
 
-from diematic_client import DiematicBoilerClient, DiematicError, DiematicStatus
+import asyncio
+from collections.abc import Iterable
+import logging
+from typing import Any
 
-from homeassistant.core import HomeAssistant
+from diematic_client import Boiler, DiematicError, DiematicStatus
 
-from .coordinator import DiematicCoordinator, UpdateFailed
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .client import DiematicClient
+from .const import (
+    DEFAULT_LIMIT_PER_HOST,
+    DEFAULT_UNIT,
+    DEFAULT_WRITE_RATE,
+    SIGNAL_CATALOG_UPDATED,
+    TRANSPORT_HTTP,
+    TRANSPORT_MODBUS,
+)
+from .coordinator import TIER_INTERVALS, TIER_SLOW, DiematicCoordinator, UpdateFailed
+from .hub import async_get_hub, async_release_hub
+from .modbus import ModbusBoilerClient
+from .register_catalog import RegisterCatalog
+from .session import async_get_daemon_session
+from .storage import DiematicStore, boiler_to_dict
+from .stream import DiematicBoilerStream
+from .write_queue import PRIORITY_SCHEDULE, PRIORITY_SETPOINT, WriteQueue
+
+# The register descriptor is compared again on the slow tier
+CATALOG_REFRESH_INTERVAL = TIER_INTERVALS[TIER_SLOW]
+
+_LOGGER = logging.getLogger(__name__)
 
 
 class DiematicBoiler:
@@ -19,41 +46,245 @@ class DiematicBoiler:
         base_path: str = "/diematic/",
         tls: bool,
         verify_ssl: bool,
+        limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+        entry_id: str | None = None,
+        write_rate: float = DEFAULT_WRITE_RATE,
+        transport: str = TRANSPORT_HTTP,
+        unit: int = DEFAULT_UNIT,
+        registers: list | None = None,
     ) -> None:
         """Initialize Diematic boiler."""
-        self.boiler_client = DiematicBoilerClient(
-            host=host,
-            port=port,
-            base_path=base_path,
-            tls=tls,
-            verify_ssl=verify_ssl,
-            request_timeout=20,
-        )
+        self._hass = hass
+        self.session = async_get_daemon_session(hass, verify_ssl)
+        self.boiler_client: DiematicClient | ModbusBoilerClient
+        if transport == TRANSPORT_MODBUS:
+            # Same interface, without the daemon in between
+            self.boiler_client = ModbusBoilerClient(
+                host=host,
+                port=port,
+                unit=unit,
+                registers=registers or [],
+                uuid=f"modbus-{host}-{port}-{unit}",
+            )
+            base_path = f"unit/{unit}"
+        else:
+            self.boiler_client = DiematicClient(
+                host=host,
+                port=port,
+                base_path=base_path,
+                tls=tls,
+                verify_ssl=verify_ssl,
+                request_timeout=20,
+                session=self.session,
+            )
+        # Every boiler of the same daemon shares the request limit and caches
+        self.hub = async_get_hub(hass, host, port, limit_per_host)
+        self.boiler_client.session_sem = self.hub.limiter
+        self.stats = self.boiler_client.stats
 
-        self.coordinator = DiematicCoordinator(
-            hass,
-            boiler_client=self.boiler_client,
-        )
+        self._endpoint = self.hub.endpoint(base_path)
+        self._single_flight = self._endpoint.single_flight
+
+        self.write_queue = WriteQueue(hass, self._async_write_register, write_rate)
+        self.coordinator = DiematicCoordinator(hass, self)
+        self.write_confirmations = self.coordinator.write_confirmations
+        self.stream = DiematicBoilerStream(hass, self)
+
+        self._catalog: RegisterCatalog | None = None
+        self._entry_id = entry_id
+
+        self.store = DiematicStore(hass, entry_id) if entry_id else None
+        self._save_scheduled = False
+
+    async def boiler(self) -> Boiler:
+        """Fetch the boiler values, joining the request already in flight."""
+        try:
+            return await self._single_flight.async_call(
+                "boiler", self.boiler_client.boiler
+            )
+        except DiematicError as error:
+            raise UpdateFailed(f"Invalid response from API: {error}") from error
+
+    async def boiler_variables(self, names: Iterable[str]) -> dict:
+        """Fetch only some of the boiler values."""
+        names = frozenset(names)
+        try:
+            return await self._single_flight.async_call(
+                ("variables", names), lambda: self.boiler_client.boiler_variables(names)
+            )
+        except DiematicError as error:
+            raise UpdateFailed(f"Invalid response from API: {error}") from error
 
     async def boiler_config(self) -> list:
-        """Fetch configuration from server daemon."""
+        """Return the configuration from server daemon, fetching it when the cache is stale."""
+        return await self._endpoint.async_get_config(self._async_fetch_config)
+
+    async def _async_fetch_config(self) -> list:
+        """Read the configuration from server daemon."""
         try:
             return await self.boiler_client.config()
         except DiematicError as error:
             raise UpdateFailed(f"Invalid response from API: {error}") from error
 
+    async def register_catalog(self) -> RegisterCatalog:
+        """Return the register catalog built from the current configuration."""
+        config = await self.boiler_config()
+        if self._catalog is None or self._catalog.config is not config:
+            self._catalog = RegisterCatalog(config)
+        return self._catalog
+
+    async def async_refresh_catalog(self, *_: Any) -> None:
+        """Read the configuration again and tell the platforms if the registers changed."""
+        previous = self._catalog
+        try:
+            # Entries sharing the daemon endpoint reuse one read per interval
+            await self._endpoint.async_get_config(
+                self._async_fetch_config, CATALOG_REFRESH_INTERVAL / 2
+            )
+            catalog = await self.register_catalog()
+        except UpdateFailed as error:
+            _LOGGER.debug("Cannot refresh the register catalog: %s", error)
+            return
+        if (
+            previous is None
+            or catalog is previous
+            or catalog.config == previous.config
+        ):
+            return
+
+        _LOGGER.info("Boiler register descriptor changed, updating the entities")
+        if self._entry_id is not None:
+            async_dispatcher_send(
+                self._hass, SIGNAL_CATALOG_UPDATED.format(self._entry_id), catalog
+            )
+
+    @callback
+    def async_invalidate_config(self) -> None:
+        """Drop the cached configuration so next call fetches it again."""
+        self._endpoint.async_invalidate_config()
+
+    async def async_restore(self) -> bool:
+        """Start from the saved snapshot and configuration, return False if there are none."""
+        if self.store is None or (cached := await self.store.async_load()) is None:
+            return False
+        boiler, config, aggregates = cached
+        self.coordinator.aggregates.restore(aggregates)
+        if not self._endpoint.config_valid():
+            self._endpoint.async_set_config(config)
+        self.coordinator.async_restore(boiler)
+        return True
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Save the current snapshot soon, unless a save is already scheduled."""
+        if self.store is None or self._save_scheduled or self.coordinator.data is None:
+            return
+        if self._endpoint.config is None and self._catalog is None:
+            return
+        self._save_scheduled = True
+        self.store.async_schedule_save(self._data_to_save)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        """Return the snapshot, configuration and aggregates to save."""
+        self._save_scheduled = False
+        config = self._endpoint.config
+        if config is None:
+            config = self._catalog.config
+        return boiler_to_dict(
+            self.coordinator.data, config, self.coordinator.aggregates.as_dict()
+        )
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop the background work and release the shared daemon state."""
+        self.stream.async_stop()
+        self.write_queue.async_shutdown()
+        self.write_confirmations.async_shutdown()
+        if isinstance(self.boiler_client, ModbusBoilerClient):
+            self.boiler_client.close()
+        async_release_hub(self._hass, self.hub)
+
     async def update_boiler_register(
+        self,
+        parameter: str,
+        value: float | str,
+        priority: int = PRIORITY_SETPOINT,
+    ) -> DiematicStatus:
+        """Update a boiler register through the write queue."""
+        return await self.write_queue.async_write(parameter, value, priority)
+
+    async def _async_write_register(
         self, parameter: str, value: float | str
     ) -> DiematicStatus:
-        """Update a boiler register."""
+        """Send one register write to the daemon."""
         try:
-            return await self.boiler_client.update_boiler_register(parameter, value)
+            result = await self.boiler_client.update_boiler_register(parameter, value)
         except DiematicError as error:
             raise UpdateFailed(f"Cannot update register value: {error}") from error
+        if result == DiematicStatus.OK:
+            self.write_confirmations.async_track(parameter, value)
+        return result
+
+    async def update_boiler_registers(
+        self,
+        values: dict[str, float | str],
+        priority: int = PRIORITY_SCHEDULE,
+    ) -> dict[str, float | str]:
+        """Update several registers and return the values actually written."""
+        current = self.coordinator.data.variables if self.coordinator.data else {}
+        # Registers with an earlier write on its way may go back to the polled value
+        busy = self.write_queue.parameters | self.write_confirmations.parameters
+        pending = {
+            parameter: value
+            for parameter, value in values.items()
+            if current.get(parameter) != value or parameter in busy
+        }
+        if not pending:
+            return {}
+
+        # The daemon writes one parameter per request, bits are not packed
+        parameters = list(pending)
+        results = await asyncio.gather(
+            *(
+                self.update_boiler_register(parameter, pending[parameter], priority)
+                for parameter in parameters
+            ),
+            return_exceptions=True,
+        )
+        for parameter, result in zip(parameters, results):
+            if isinstance(result, UpdateFailed):
+                _LOGGER.error(
+                    "Error setting parameter '%s' value to diematic boiler: {%s}",
+                    parameter,
+                    result,
+                )
+                del pending[parameter]
+            elif isinstance(result, BaseException):
+                raise result
+            elif result != DiematicStatus.OK:
+                _LOGGER.error(
+                    "Setting parameter value '%s' returned error but no additional information",
+                    parameter,
+                )
+                del pending[parameter]
+
+        return pending
+
+    async def async_wait_confirmation(
+        self, values: dict[str, float | str]
+    ) -> dict[str, float | str]:
+        """Wait until the boiler reports the written values, return the ones that did not."""
+        unconfirmed = await self.write_confirmations.async_wait(values)
+        return {parameter: values[parameter] for parameter in unconfirmed}
 
     async def read_boiler_register(self, parameter: str) -> dict:
         """Read the content of a single register."""
         try:
-            return await self.boiler_client.read_boiler_register(parameter)
+            # Joins the identical read already in flight
+            return await self._single_flight.async_call(
+                ("register", parameter),
+                lambda: self.boiler_client.read_boiler_register(parameter),
+            )
         except DiematicError as error:
             raise UpdateFailed(f"Cannot read register value: {error}") from error
@@ -1,11 +1,63 @@
 """Entities from the Diematic integration."""
 from __future__ import annotations
 
-from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from collections.abc import Callable, Iterable
+import logging
+from typing import Any
 
-from .const import DOMAIN
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import DeviceInfo, Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity, UpdateFailed
+
+from .const import DOMAIN, SIGNAL_CATALOG_UPDATED
 from .diematic_bolier import DiematicBoiler
+from .register_catalog import RegisterCatalog
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_catalog_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    diematic_boiler: DiematicBoiler,
+    async_add_entities: AddEntitiesCallback,
+    build: Callable[[RegisterCatalog], list[Entity]],
+) -> None:
+    """Add the entities built from the register catalog and follow its changes."""
+    entities = {
+        entity.unique_id: entity
+        for entity in build(await diematic_boiler.register_catalog())
+    }
+    async_add_entities(list(entities.values()))
+
+    async def async_catalog_updated(catalog: RegisterCatalog) -> None:
+        """Add the entities of new registers and remove those of dropped registers."""
+        wanted = {entity.unique_id: entity for entity in build(catalog)}
+        registry = er.async_get(hass)
+        for unique_id in [key for key in entities if key not in wanted]:
+            entity = entities.pop(unique_id)
+            _LOGGER.debug("Removing %s, its register is gone", entity.entity_id)
+            if entity.registry_entry is not None:
+                # Removing the registry entry also removes the entity
+                registry.async_remove(entity.entity_id)
+            else:
+                await entity.async_remove()
+
+        # Entities kept keep their state, history and listeners
+        added = [entity for key, entity in wanted.items() if key not in entities]
+        entities.update((entity.unique_id, entity) for entity in added)
+        if added:
+            async_add_entities(added)
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_CATALOG_UPDATED.format(entry.entry_id), async_catalog_updated
+        )
+    )
 
 
 class DiematicEntity(CoordinatorEntity):
@@ -20,9 +72,14 @@ class DiematicEntity(CoordinatorEntity):
         name: str,
         icon: str,
         enabled_default: bool = True,
+        variables: Iterable[str] | None = None,
     ) -> None:
         """Initialize the Diematic entity."""
-        super().__init__(diematic_boiler.coordinator)
+        # The coordinator only wakes the entity when one of its variables changes
+        super().__init__(
+            diematic_boiler.coordinator,
+            frozenset(variables) if variables is not None else None,
+        )
         self._diematic_boiler = diematic_boiler
         self._device_id = device_id
         self._entry_id = entry_id
@@ -43,3 +100,50 @@ class DiematicEntity(CoordinatorEntity):
             name=self.coordinator.data.info.name,
             sw_version=self.coordinator.data.info.version,
         )
+
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while the state comes from the snapshot of a previous run."""
+        return self.coordinator.stale
+
+    async def _async_write_values(self, values: dict[str, Any], priority: int) -> None:
+        """Show the values at once and queue their writes, which finish in background."""
+        self.coordinator.async_set_optimistic(values)
+        # A full weekly program takes more than a minute at the default write rate
+        self.hass.async_create_background_task(
+            self._async_write_and_confirm(values, priority),
+            f"diematic write {self.entity_id}",
+        )
+
+    async def _async_write_and_confirm(
+        self, values: dict[str, Any], priority: int
+    ) -> None:
+        """Write the values, rolling back, with a warning, those the boiler does not report."""
+        try:
+            written = await self._diematic_boiler.update_boiler_registers(
+                values, priority
+            )
+        except UpdateFailed as error:
+            _LOGGER.error(
+                "Error setting parameters '%s' value to diematic boiler: {%s}",
+                ", ".join(values),
+                error,
+            )
+            self.coordinator.async_clear_optimistic(values)
+            return
+
+        # Values already set or rejected by the daemon show the boiler value again
+        self.coordinator.async_clear_optimistic(
+            {name: value for name, value in values.items() if name not in written}
+        )
+        if not written:
+            return
+
+        unconfirmed = await self._diematic_boiler.async_wait_confirmation(written)
+        for variable, write_value in unconfirmed.items():
+            _LOGGER.warning(
+                "Timeout setting value '%s' to register '%s', showing the boiler value again",
+                write_value,
+                variable,
+            )
+        self.coordinator.async_clear_optimistic(written)
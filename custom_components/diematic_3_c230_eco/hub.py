@@ -0,0 +1,170 @@
+"""State shared by every config entry talking to the same diematic daemon."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+import time
+
+from homeassistant.core import HomeAssistant, callback
+
+from .coalescer import SingleFlight
+from .const import DOMAIN
+
+DATA_HUBS = f"{DOMAIN}_hubs"
+CONFIG_TTL = timedelta(hours=1)
+# Minimum delay between the polls of two boilers served by the same daemon
+POLL_SPACING = timedelta(seconds=1)
+
+
+class RequestLimiter:
+    """Limit of concurrent requests that can change while requests are running."""
+
+    def __init__(self, limit: int) -> None:
+        """Initialize the limiter."""
+        self.limit = limit
+        self.active = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    async def __aenter__(self) -> None:
+        """Wait until a request can start."""
+        while self.active >= self.limit:
+            waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                else:
+                    # Hand the wake up over to the next request
+                    self._wake()
+                raise
+        self.active += 1
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Let a waiting request start."""
+        self.active -= 1
+        self._wake()
+
+    @callback
+    def async_set_limit(self, limit: int) -> None:
+        """Change the limit, requests already running finish normally."""
+        self.limit = limit
+        self._wake()
+
+    def _wake(self) -> None:
+        """Wake as many waiting requests as the limit allows."""
+        free = self.limit - self.active
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+
+class DaemonEndpoint:
+    """Caches of one base path of a daemon, shared by the entries using it."""
+
+    def __init__(self) -> None:
+        """Initialize empty caches."""
+        self.single_flight = SingleFlight()
+        self.config: list | None = None
+        self._fetched: float = 0.0
+        self._lock = asyncio.Lock()
+
+    def config_valid(self, max_age: timedelta = CONFIG_TTL) -> bool:
+        """Return True if the cached configuration can still be used."""
+        return (
+            self.config is not None
+            and time.monotonic() - self._fetched < max_age.total_seconds()
+        )
+
+    async def async_get_config(
+        self, fetch: Callable[[], Awaitable[list]], max_age: timedelta = CONFIG_TTL
+    ) -> list:
+        """Return the configuration, calling fetch when the cache is older than max_age."""
+        if self.config_valid(max_age):
+            return self.config
+
+        # Concurrent callers wait here and reuse the single in-flight request
+        async with self._lock:
+            if not self.config_valid(max_age):
+                self.async_set_config(await fetch())
+        return self.config
+
+    @callback
+    def async_set_config(self, config: list) -> None:
+        """Store a configuration read from the daemon or restored from disk."""
+        self.config = config
+        self._fetched = time.monotonic()
+
+    @callback
+    def async_invalidate_config(self) -> None:
+        """Drop the cached configuration so next call fetches it again."""
+        self.config = None
+        self._fetched = 0.0
+
+
+class DiematicHub:
+    """Request limit, poll spacing and caches of one daemon host."""
+
+    def __init__(self, host: str, port: int, limit: int) -> None:
+        """Initialize the hub of a daemon."""
+        self.host = host
+        self.port = port
+        # Shared by the clients of every entry, its limit changes in place
+        self.limiter = RequestLimiter(limit)
+        self.boilers = 0
+        self._endpoints: dict[str, DaemonEndpoint] = {}
+        self._poll_lock = asyncio.Lock()
+        self._last_poll: float = 0.0
+        self._last_poller: object | None = None
+
+    @property
+    def limit(self) -> int:
+        """Return the maximum number of concurrent requests to the daemon."""
+        return self.limiter.limit
+
+    @callback
+    def async_set_limit(self, limit: int) -> None:
+        """Change the request limit of every entry using the daemon."""
+        self.limiter.async_set_limit(limit)
+
+    @callback
+    def endpoint(self, base_path: str) -> DaemonEndpoint:
+        """Return the caches of a base path."""
+        if (endpoint := self._endpoints.get(base_path)) is None:
+            endpoint = self._endpoints[base_path] = DaemonEndpoint()
+        return endpoint
+
+    async def async_poll_turn(self, poller: object) -> None:
+        """Wait until the poll of another boiler of this daemon is far enough in the past."""
+        async with self._poll_lock:
+            delay = self._last_poll + POLL_SPACING.total_seconds() - time.monotonic()
+            if delay > 0 and poller is not self._last_poller:
+                await asyncio.sleep(delay)
+            self._last_poll = time.monotonic()
+            self._last_poller = poller
+
+
+@callback
+def async_get_hub(hass: HomeAssistant, host: str, port: int, limit: int) -> DiematicHub:
+    """Return the hub of a daemon, creating it for its first boiler."""
+    hubs: dict[tuple[str, int], DiematicHub] = hass.data.setdefault(DATA_HUBS, {})
+    if (hub := hubs.get((host, port))) is None:
+        hub = hubs[(host, port)] = DiematicHub(host, port, limit)
+    else:
+        hub.async_set_limit(limit)
+    hub.boilers += 1
+    return hub
+
+
+@callback
+def async_release_hub(hass: HomeAssistant, hub: DiematicHub) -> None:
+    """Forget the hub of a daemon once its last boiler is gone."""
+    hub.boilers -= 1
+    if hub.boilers <= 0:
+        hass.data.get(DATA_HUBS, {}).pop((hub.host, hub.port), None)
@@ -0,0 +1,164 @@
+"""Latency and throughput statistics of the requests sent to the diematic daemon."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+import heapq
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+SLOWEST_CALLS = 10
+EWMA_WEIGHT = 0.2
+# Operations of the Modbus transport, kept apart from the daemon requests
+OPERATION_MODBUS_READ = "modbus_read"
+OPERATION_MODBUS_WRITE = "modbus_write"
+# Operation reading the boiler values, by transport
+POLL_OPERATIONS = ("boiler", OPERATION_MODBUS_READ)
+
+
+@dataclass
+class OperationStats:
+    """Counters of one kind of request."""
+
+    count: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    ewma_ms: float | None = None
+    queued_ms: float = 0.0
+    payload_bytes: int = 0
+    # Responses identical to the previous one, by validator or content hash
+    unchanged: int = 0
+    buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    )
+
+    def record(
+        self,
+        latency_ms: float,
+        queued_ms: float,
+        size: int,
+        error: bool,
+        unchanged: bool = False,
+    ) -> None:
+        """Add one request to the counters."""
+        self.count += 1
+        self.errors += error
+        self.unchanged += unchanged
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+        self.queued_ms += queued_ms
+        self.payload_bytes += size
+        if self.ewma_ms is None:
+            self.ewma_ms = latency_ms
+        else:
+            self.ewma_ms += EWMA_WEIGHT * (latency_ms - self.ewma_ms)
+        bucket = 0
+        while bucket < len(LATENCY_BUCKETS_MS) and latency_ms > LATENCY_BUCKETS_MS[bucket]:
+            bucket += 1
+        self.buckets[bucket] += 1
+
+    @property
+    def error_rate(self) -> float:
+        """Return the fraction of requests that failed."""
+        return self.errors / self.count if self.count else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters in a serializable form."""
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 4),
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "recent_ms": round(self.ewma_ms, 1) if self.ewma_ms is not None else None,
+            "max_ms": round(self.max_ms, 1),
+            "mean_queued_ms": round(self.queued_ms / self.count, 1)
+            if self.count
+            else None,
+            "payload_bytes": self.payload_bytes,
+            "unchanged": self.unchanged,
+            "histogram_ms": {
+                f"<={limit}": self.buckets[index]
+                for index, limit in enumerate(LATENCY_BUCKETS_MS)
+            }
+            | {f">{LATENCY_BUCKETS_MS[-1]}": self.buckets[-1]},
+        }
+
+
+@dataclass(order=True)
+class SlowCall:
+    """One of the slowest requests seen."""
+
+    latency_ms: float
+    operation: str = field(compare=False)
+    uri: str = field(compare=False)
+    when: datetime = field(compare=False)
+    error: bool = field(compare=False)
+
+
+class RequestStats:
+    """Statistics of every request sent by one boiler client."""
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.operations: dict[str, OperationStats] = {}
+        self._slowest: list[SlowCall] = []
+
+    def record(
+        self,
+        operation: str,
+        uri: str,
+        latency_ms: float,
+        queued_ms: float,
+        size: int,
+        error: bool,
+        unchanged: bool = False,
+    ) -> None:
+        """Add one request to the statistics."""
+        self.operations.setdefault(operation, OperationStats()).record(
+            latency_ms, queued_ms, size, error, unchanged
+        )
+        call = SlowCall(latency_ms, operation, uri, dt_util.utcnow(), error)
+        if len(self._slowest) < SLOWEST_CALLS:
+            heapq.heappush(self._slowest, call)
+        elif call > self._slowest[0]:
+            heapq.heapreplace(self._slowest, call)
+
+    @property
+    def polls(self) -> OperationStats | None:
+        """Return the counters of the requests reading the boiler values."""
+        for operation in POLL_OPERATIONS:
+            if (stats := self.operations.get(operation)) is not None:
+                return stats
+        return None
+
+    @property
+    def totals(self) -> OperationStats:
+        """Return the counters of every operation together."""
+        totals = OperationStats()
+        for stats in self.operations.values():
+            totals.count += stats.count
+            totals.errors += stats.errors
+        return totals
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics in a serializable form."""
+        return {
+            "operations": {
+                operation: stats.as_dict()
+                for operation, stats in self.operations.items()
+            },
+            "slowest": [
+                {
+                    "operation": call.operation,
+                    "uri": call.uri,
+                    "latency_ms": round(call.latency_ms, 1),
+                    "when": call.when.isoformat(),
+                    "error": call.error,
+                }
+                for call in sorted(self._slowest, reverse=True)
+            ],
+        }
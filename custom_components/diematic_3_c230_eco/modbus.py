@@ -0,0 +1,309 @@
+"""Modbus RTU over TCP transport talking to the boiler without the diematic daemon.
+
+The registers are described by the same register map the daemon reads,
+a ``registers`` list where every entry has the Modbus address in ``id``:
+
+- ``type: bits`` registers hold up to 16 named bits, first name in bit 15
+- ``type: DiematicOneDecimal`` registers hold a sign and magnitude value
+  in tenths
+- any other type is read as a sign and magnitude integer
+
+The client exposes the same methods as DiematicClient so DiematicBoiler
+works on top of either of them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import logging
+import struct
+import time
+from typing import Any
+
+import async_timeout
+from diematic_client import (
+    Boiler,
+    DiematicConnectionError,
+    DiematicParseError,
+    DiematicResponseError,
+    DiematicStatus,
+)
+
+from homeassistant.util.yaml import load_yaml
+
+from .metrics import OPERATION_MODBUS_READ, OPERATION_MODBUS_WRITE, RequestStats
+from .register_catalog import BITS_TYPE
+
+READ_HOLDING_REGISTERS = 0x03
+WRITE_MULTIPLE_REGISTERS = 0x10
+ONE_DECIMAL_TYPE = "DiematicOneDecimal"
+# The boiler answers at most 64 registers per read
+MAX_BLOCK = 64
+# Unused addresses read to join two blocks instead of sending another request
+MAX_GAP = 8
+NO_VALUE = 0xFFFF
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def crc16(frame: bytes) -> int:
+    """Return the Modbus RTU CRC of a frame."""
+    crc = 0xFFFF
+    for byte in frame:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+def read_blocks(addresses: Iterable[int]) -> list[tuple[int, int]]:
+    """Group register addresses into (start, count) reads of nearby registers."""
+    blocks: list[tuple[int, int]] = []
+    for address in sorted(set(addresses)):
+        if blocks:
+            start, count = blocks[-1]
+            if address - (start + count) <= MAX_GAP and address - start < MAX_BLOCK:
+                blocks[-1] = (start, address - start + 1)
+                continue
+        blocks.append((address, 1))
+    return blocks
+
+
+def decode(register: dict[str, Any], raw: int) -> dict[str, Any]:
+    """Return the variables held by the raw value of a register."""
+    if register.get("type") == BITS_TYPE:
+        return {
+            bit: (raw >> (15 - index)) & 1
+            for index, bit in enumerate(register.get("bits", ())[:16])
+            if bit
+        }
+    if raw == NO_VALUE:
+        return {register["name"]: None}
+    value = -(raw & 0x7FFF) if raw & 0x8000 else raw
+    if register.get("type") == ONE_DECIMAL_TYPE:
+        return {register["name"]: value / 10}
+    return {register["name"]: value}
+
+
+def encode(register: dict[str, Any], value: float | str) -> int:
+    """Return the raw value storing a register value."""
+    value = float(value)
+    if register.get("type") == ONE_DECIMAL_TYPE:
+        value *= 10
+    raw = round(abs(value))
+    if raw > 0x7FFF:
+        raise DiematicParseError(
+            f"Value {value} does not fit register '{register['name']}'"
+        )
+    return raw | 0x8000 if value < 0 else raw
+
+
+def load_register_map(path: str) -> list[dict[str, Any]]:
+    """Read the registers of a daemon register map file, in the executor."""
+    data = load_yaml(path)
+    registers = data.get("registers") if isinstance(data, dict) else data
+    if not isinstance(registers, list):
+        raise DiematicParseError(f"No registers list in {path}")
+    return [
+        register
+        for register in registers
+        if isinstance(register, dict) and "id" in register
+    ]
+
+
+class ModbusBoilerClient:
+    """Boiler client sending Modbus RTU frames over a TCP serial gateway."""
+
+    def __init__(
+        self,
+        *,
+        host: str,
+        port: int,
+        unit: int,
+        registers: list[dict[str, Any]],
+        uuid: str,
+        request_timeout: float = 10,
+    ) -> None:
+        """Initialize the client with the register map of the boiler."""
+        self.host = host
+        self.port = port
+        self.unit = unit
+        self.uuid = uuid
+        self.request_timeout = request_timeout
+        self.session_sem = asyncio.Semaphore()
+        self.stats = RequestStats()
+        self._config = registers
+        self._registers: dict[str, dict[str, Any]] = {}
+        self._owners: dict[str, dict[str, Any]] = {}
+        self._by_address: dict[int, list[dict[str, Any]]] = {}
+        for register in registers:
+            # Bits registers may have no name, other registers need one
+            if register.get("type") == BITS_TYPE:
+                for bit in register.get("bits", ()):
+                    if bit:
+                        self._owners[bit] = register
+            elif "name" not in register:
+                continue
+            self._by_address.setdefault(int(register["id"]), []).append(register)
+            if "name" in register:
+                self._registers[register["name"]] = register
+        self._blocks = read_blocks(self._by_address)
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        # The bus carries one request at a time
+        self._lock = asyncio.Lock()
+
+    async def boiler(self) -> Boiler:
+        """Read every register of the map."""
+        variables = await self._async_read_blocks(self._blocks)
+        return Boiler.from_dict({"uuid": self.uuid, **variables})
+
+    async def boiler_variables(self, names: Iterable[str]) -> dict[str, Any]:
+        """Read only the registers holding the named variables."""
+        addresses = [
+            int(register["id"])
+            for name in names
+            if (register := self._register_of(name)) is not None
+        ]
+        variables = await self._async_read_blocks(read_blocks(addresses))
+        return {name: variables[name] for name in names if name in variables}
+
+    async def config(self) -> list:
+        """Return the register map, shaped like the daemon configuration."""
+        return self._config
+
+    async def read_boiler_register(self, parameter: str) -> dict:
+        """Read the register holding a variable."""
+        if (register := self._register_of(parameter)) is None:
+            raise DiematicResponseError(f"Unknown register '{parameter}'")
+        address = int(register["id"])
+        (raw,) = await self._async_read(address, 1)
+        return {"status": "read", "value": decode(register, raw).get(parameter)}
+
+    async def update_boiler_register(
+        self, parameter: str, value: float | str
+    ) -> DiematicStatus:
+        """Write a register, or one bit of it after reading the others."""
+        if (register := self._register_of(parameter)) is None:
+            raise DiematicResponseError(f"Unknown register '{parameter}'")
+        address = int(register["id"])
+        if register.get("type") == BITS_TYPE:
+            (raw,) = await self._async_read(address, 1)
+            mask = 1 << (15 - register["bits"].index(parameter))
+            raw = raw | mask if int(value) else raw & ~mask
+        else:
+            raw = encode(register, value)
+        await self._async_write(address, [raw])
+        return DiematicStatus.OK
+
+    def close(self) -> None:
+        """Close the connection to the gateway."""
+        if self._writer is not None:
+            self._writer.close()
+            self._reader = self._writer = None
+
+    def _register_of(self, name: str) -> dict[str, Any] | None:
+        """Return the register holding a variable or bit."""
+        if (owner := self._owners.get(name)) is not None:
+            return owner
+        return self._registers.get(name)
+
+    async def _async_read_blocks(
+        self, blocks: list[tuple[int, int]]
+    ) -> dict[str, Any]:
+        """Read register blocks and decode the registers of the map they hold."""
+        variables: dict[str, Any] = {}
+        for start, count in blocks:
+            for offset, raw in enumerate(await self._async_read(start, count)):
+                for register in self._by_address.get(start + offset, ()):
+                    variables.update(decode(register, raw))
+        return variables
+
+    async def _async_read(self, address: int, count: int) -> tuple[int, ...]:
+        """Read holding registers."""
+        pdu = struct.pack(">BHH", READ_HOLDING_REGISTERS, address, count)
+        data = await self._async_transaction(pdu, OPERATION_MODBUS_READ, address)
+        if len(data) != 2 * count:
+            raise DiematicParseError(f"Expected {count} registers at {address}")
+        return struct.unpack(f">{count}H", data)
+
+    async def _async_write(self, address: int, values: list[int]) -> None:
+        """Write holding registers."""
+        pdu = struct.pack(
+            f">BHHB{len(values)}H",
+            WRITE_MULTIPLE_REGISTERS,
+            address,
+            len(values),
+            2 * len(values),
+            *values,
+        )
+        await self._async_transaction(pdu, OPERATION_MODBUS_WRITE, address)
+
+    async def _async_transaction(
+        self, pdu: bytes, operation: str, address: int
+    ) -> bytes:
+        """Send a request and return the data of the response, recording its latency."""
+        queued = time.perf_counter()
+        async with self.session_sem, self._lock:
+            start = time.perf_counter()
+            size = 0
+            error = True
+            try:
+                async with async_timeout.timeout(self.request_timeout):
+                    response = await self._async_exchange(pdu)
+                size = len(response)
+                error = False
+                return response
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, OSError) as exc:
+                self.close()
+                raise DiematicConnectionError(
+                    f"Error communicating with Modbus gateway {self.host}:{self.port}"
+                ) from exc
+            except (DiematicParseError, DiematicResponseError):
+                # Never reuse a stream that may hold the rest of a bad response
+                self.close()
+                raise
+            finally:
+                self.stats.record(
+                    operation,
+                    f"{pdu[0]:#04x}@{address}",
+                    (time.perf_counter() - start) * 1000,
+                    (start - queued) * 1000,
+                    size,
+                    error,
+                )
+
+    async def _async_exchange(self, pdu: bytes) -> bytes:
+        """Send one RTU frame and return the data of the response frame."""
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+        frame = bytes([self.unit]) + pdu
+        self._writer.write(frame + struct.pack("<H", crc16(frame)))
+        await self._writer.drain()
+
+        header = await self._reader.readexactly(2)
+        if header[0] != self.unit:
+            raise DiematicParseError(f"Response from unit {header[0]}")
+        if header[1] == pdu[0] | 0x80:
+            body = await self._reader.readexactly(1)
+            await self._reader.readexactly(2)
+            raise DiematicResponseError(
+                f"Modbus exception {body[0]} for function {pdu[0]:#04x}"
+            )
+        if header[1] != pdu[0]:
+            raise DiematicParseError(f"Response to function {header[1]:#04x}")
+        if header[1] == READ_HOLDING_REGISTERS:
+            length = await self._reader.readexactly(1)
+            body = length + await self._reader.readexactly(length[0])
+            data = body[1:]
+        else:
+            # Write responses repeat the address and the number of registers
+            body = await self._reader.readexactly(4)
+            data = body
+        (crc,) = struct.unpack("<H", await self._reader.readexactly(2))
+        if crc != crc16(header + body):
+            raise DiematicParseError("Invalid CRC in Modbus response")
+        return data
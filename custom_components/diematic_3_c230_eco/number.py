@@ -1,10 +1,5 @@
 """Support for setting values to the boiler registers."""
 
-import asyncio
-import logging
-
-from diematic_client import DiematicError, DiematicStatus
-
 from homeassistant.components.number import NumberEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
@@ -12,9 +7,9 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
 from .diematic_bolier import DiematicBoiler
-from .entity import DiematicEntity
-
-_LOGGER = logging.getLogger(__name__)
+from .entity import DiematicEntity, async_setup_catalog_entities
+from .register_catalog import RegisterCatalog
+from .write_queue import PRIORITY_SETPOINT
 
 
 async def async_setup_entry(
@@ -28,36 +23,25 @@ async def async_setup_entry(
     if (unique_id := config_entry.unique_id) is None:
         unique_id = config_entry.unique_id
 
-    config = await diematic_boiler.boiler_config()
-
-    numbers: list[NumberEntity] = [
-        DiematicNumber(
-            config_entry.entry_id,
-            unique_id,
-            diematic_boiler,
-            cal["name"],
-            cal["desc"],
-            float(cal["step"]),
-            float(cal["max"]),
-            float(cal["min"]),
-        )
-        for cal in config
-        if (
-            "ha" in list(cal)
-            and cal["ha"]
-            and "unit" in list(cal)
-            and (
-                cal["unit"] == "CelsiusTemperature"
-                or cal["unit"] == "°C"
-                or cal["unit"] == "K"
+    def temperature_numbers(catalog: RegisterCatalog) -> list[NumberEntity]:
+        """Return a number per writable temperature register."""
+        return [
+            DiematicNumber(
+                config_entry.entry_id,
+                unique_id,
+                diematic_boiler,
+                cal["name"],
+                cal["desc"],
+                float(cal["step"]),
+                float(cal["max"]),
+                float(cal["min"]),
             )
-            and "step" in list(cal)
-            and "max" in list(cal)
-            and "min" in list(cal)
-        )
-    ]
+            for cal in catalog.temperature_numbers()
+        ]
 
-    async_add_entities(numbers, True)
+    await async_setup_catalog_entities(
+        hass, config_entry, diematic_boiler, async_add_entities, temperature_numbers
+    )
 
 
 class DiematicNumber(DiematicEntity, NumberEntity):
@@ -87,42 +71,15 @@ class DiematicNumber(DiematicEntity, NumberEntity):
             icon="mdi:thermometer",
             name=name,
             device_id=unique_id,
+            variables=(variable,),
         )
 
     @property
     def native_value(self) -> float:
         """Obtain the native value."""
-        return self.coordinator.data.variables[self.variable]
+        return self.coordinator.variables[self.variable]
 
     async def async_set_native_value(self, value: float) -> None:
         """Set the native value asynchronusly."""
-        try:
-            result = await self._diematic_boiler.update_boiler_register(
-                self.variable, value
-            )
-            if result == DiematicStatus.OK:
-                i = 0
-                while i < 20:
-                    i += 1
-                    await asyncio.sleep(1)
-                    readresult = await self._diematic_boiler.read_boiler_register(
-                        self.variable
-                    )
-                    if (
-                        "status" in readresult
-                        and readresult["status"] == "read"
-                        and readresult["value"] == value
-                    ):
-                        self.async_schedule_update_ha_state(True)
-                        break
-            else:
-                _LOGGER.error(
-                    "Setting parameter value '%s' returned error but no additional information",
-                    self.variable,
-                )
-        except DiematicError as error:
-            _LOGGER.error(
-                "Error setting parameter '%s' value to diematic boiler: {%s}",
-                self.variable,
-                error,
-            )
+        # The state shows the new value at once, confirmation happens in background
+        await self._async_write_values({self.variable: value}, PRIORITY_SETPOINT)
@@ -0,0 +1,95 @@
+"""Index of the boiler registers described by the diematic daemon configuration."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any
+
+from .const import CIRCUITS, TEMPERATURE_UNITS
+
+BITS_TYPE = "bits"
+WRITABLE_KEYS = ("step", "max", "min")
+
+
+class RegisterCatalog:
+    """Precomputed lookups over the list returned by the daemon /config endpoint."""
+
+    def __init__(self, config: list[dict[str, Any]]) -> None:
+        """Build every index in a single pass over the configuration."""
+        self.config = config
+        self.registers: dict[str, dict[str, Any]] = {}
+        self.bit_register: dict[str, str] = {}
+        self.ha: set[str] = set()
+        self.writable: set[str] = set()
+        self.readonly: set[str] = set()
+        self.temperatures: set[str] = set()
+        self.by_type: dict[str, set[str]] = defaultdict(set)
+        self.by_unit: dict[str, set[str]] = defaultdict(set)
+        self.by_circuit: dict[str, set[str]] = defaultdict(set)
+
+        for index, register in enumerate(config):
+            if register.get("type") == BITS_TYPE and "bits" in register:
+                # The bits are the variables, a register without a name is
+                # known by its position in the configuration
+                owner = register.get("name", f"#{index}")
+                for bit in register["bits"]:
+                    self.bit_register[bit] = owner
+                    if (circuit := _circuit_of(bit)) is not None:
+                        self.by_circuit[circuit].add(bit)
+            if "name" not in register:
+                continue
+            name = register["name"]
+            self.registers[name] = register
+            if register.get("ha"):
+                self.ha.add(name)
+            if "type" in register:
+                self.by_type[register["type"]].add(name)
+            if (unit := register.get("unit")) is not None:
+                self.by_unit[unit].add(name)
+                if unit in TEMPERATURE_UNITS:
+                    self.temperatures.add(name)
+            # Registers with only some of the limits are neither writable nor readonly
+            present = [key in register for key in WRITABLE_KEYS]
+            if all(present):
+                self.writable.add(name)
+            elif not any(present):
+                self.readonly.add(name)
+            if (circuit := _circuit_of(name)) is not None:
+                self.by_circuit[circuit].add(name)
+
+    @property
+    def bits(self) -> dict[str, str]:
+        """Return the names of all the bits, mapped to the register holding them."""
+        return self.bit_register
+
+    def __contains__(self, name: object) -> bool:
+        """Return True if name is a register or a bit known by the daemon."""
+        return name in self.registers or name in self.bit_register
+
+    def has_schedule(self, circuit: str, day_of_week: str) -> bool:
+        """Return True if the boiler exposes the day program of a circuit."""
+        return f"{day_of_week}_{circuit}_0000_0030" in self.bit_register
+
+    def temperature_sensors(self) -> list[dict[str, Any]]:
+        """Return the readonly temperature registers enabled for Home Assistant."""
+        return [
+            register
+            for name, register in self.registers.items()
+            if name in self.ha and name in self.temperatures and name in self.readonly
+        ]
+
+    def temperature_numbers(self) -> list[dict[str, Any]]:
+        """Return the writable temperature registers enabled for Home Assistant."""
+        return [
+            register
+            for name, register in self.registers.items()
+            if name in self.ha and name in self.temperatures and name in self.writable
+        ]
+
+
+def _circuit_of(name: str) -> str | None:
+    """Return the circuit a register or bit name belongs to, if any."""
+    for part in name.split("_"):
+        if part in CIRCUITS:
+            return part
+    return None
@@ -1,18 +1,22 @@
 """The De Dietrich C-230 Eco scheduler."""
 
 import logging
-from typing import Any
 
 from homeassistant.components.schedule import DOMAIN as SCHEDULE_DOMAIN, Schedule
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_component import EntityComponent
-from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from .const import CIRCUITS, DAYS_OF_WEEK, DOMAIN, SIGNAL_CATALOG_UPDATED
+from .coordinator import DiematicCoordinator
 from .diematic_bolier import DiematicBoiler
+from .register_catalog import RegisterCatalog
+from .schedule_engine import bitmap_from_variables, bitmap_to_ranges, slot_names
 
 LOGGER = logging.getLogger(__package__)
 DATA_INSTANCES = "entity_components"
+DATA_SCHEDULES = f"{DOMAIN}_schedules"
 
 
 class DiematicBoilerSchedule(Schedule):
@@ -20,116 +24,141 @@ class DiematicBoilerSchedule(Schedule):
 
     def __init__(
         self,
-        config: ConfigType,
+        coordinator: DiematicCoordinator,
+        boiler_key: str,
+        circuit: str,
+        days_of_week: list[str],
     ) -> None:
         """Initialize a Diematic Bouler Schedule."""
+        self._coordinator = coordinator
+        self._varnames = {
+            day_of_week: f"{day_of_week}_{circuit}" for day_of_week in days_of_week
+        }
+        self._bitmaps = {
+            day_of_week: bitmap_from_variables(varname, coordinator.variables)
+            for day_of_week, varname in self._varnames.items()
+        }
+        config = {
+            "name": f"Scheduler {circuit}",
+            "id": f"scheduler_{circuit}_{boiler_key}",
+        }
+        for day_of_week, bitmap in self._bitmaps.items():
+            config[day_of_week] = bitmap_to_ranges(bitmap)
         super().__init__(config, True)
 
+    @property
+    def days_of_week(self) -> list[str]:
+        """Return the days the boiler has a program for."""
+        return list(self._varnames)
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the coordinator updates of the day program bits."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._coordinator.async_add_listener(
+                self._handle_coordinator_update,
+                frozenset(
+                    name
+                    for varname in self._varnames.values()
+                    for name in slot_names(varname)
+                ),
+            )
+        )
 
-async def async_setup(hass: HomeAssistant) -> bool:
-    """Set up async."""
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Rebuild only the days whose program bits changed."""
+        if not self._coordinator.last_update_success:
+            return
+        variables = self._coordinator.variables
+        config = dict(self._config)
+        changed = False
+        for day_of_week, varname in self._varnames.items():
+            bitmap = bitmap_from_variables(varname, variables)
+            if bitmap != self._bitmaps[day_of_week]:
+                self._bitmaps[day_of_week] = bitmap
+                config[day_of_week] = bitmap_to_ranges(bitmap)
+                changed = True
+        if changed:
+            self.hass.async_create_task(self.async_update_config(config))
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up the schedules of a config entry, once."""
+    schedules: dict[str, list[Schedule]] = hass.data.setdefault(DATA_SCHEDULES, {})
+    if entry.entry_id in schedules:
+        return True
 
     component: EntityComponent[Schedule] = hass.data.get(DATA_INSTANCES, {}).get(
         SCHEDULE_DOMAIN
     )
 
-    week_timer_programmers: list[Schedule] = await _prepare_schedules(hass)
+    diematic_boiler: DiematicBoiler = hass.data[DOMAIN][entry.entry_id]
+    week_timer_programmers = await _prepare_schedules(entry.entry_id, diematic_boiler)
+    schedules[entry.entry_id] = week_timer_programmers
 
     await component.async_add_entities(week_timer_programmers)
 
-    return True
+    async def async_catalog_updated(catalog: RegisterCatalog) -> None:
+        """Replace the schedules of the circuits whose days changed."""
+        current = schedules.get(entry.entry_id, [])
+        updated: list[Schedule] = []
+        added: list[Schedule] = []
+        for schedule, new_schedule in zip(
+            current, _build_schedules(entry.entry_id, diematic_boiler, catalog)
+        ):
+            if new_schedule.days_of_week == schedule.days_of_week:
+                updated.append(schedule)
+                continue
+            await schedule.async_remove()
+            updated.append(new_schedule)
+            added.append(new_schedule)
+        schedules[entry.entry_id] = updated
+        if added:
+            await component.async_add_entities(added)
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_CATALOG_UPDATED.format(entry.entry_id), async_catalog_updated
+        )
+    )
 
+    return True
 
-async def _prepare_schedules(hass: HomeAssistant) -> list[Schedule]:
-    """Read the information from diematic and prepare schedules."""
-    week_timer_programmers: list[Schedule] = []
 
-    for boiler_key in hass.data[DOMAIN]:
-        diematic_boiler: DiematicBoiler = hass.data[DOMAIN][boiler_key]
-        LOGGER.debug("Boiler {%s}", boiler_key)
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the schedules of a config entry."""
+    for week_timer_programmer in hass.data.get(DATA_SCHEDULES, {}).pop(
+        entry.entry_id, []
+    ):
+        await week_timer_programmer.async_remove()
 
-        bitstypes = await _prepare_bitstypes(diematic_boiler)
 
-        week_timer_programmers.extend(
-            _process_circuit(
-                circuit,
-                boiler_key,
-                bitstypes,
-                diematic_boiler.coordinator.data.variables,
-            )
-            for circuit in ("a", "b", "c", "acs")
-        )
+async def _prepare_schedules(
+    boiler_key: str, diematic_boiler: DiematicBoiler
+) -> list[Schedule]:
+    """Read the information from diematic and prepare schedules."""
+    LOGGER.debug("Boiler {%s}", boiler_key)
 
-    return week_timer_programmers
+    catalog = await diematic_boiler.register_catalog()
 
+    return _build_schedules(boiler_key, diematic_boiler, catalog)
 
-async def _prepare_bitstypes(diematic_boiler: DiematicBoiler) -> list[str]:
-    """Collect all variables of type bits."""
-    config = await diematic_boiler.boiler_config()
 
+def _build_schedules(
+    boiler_key: str, diematic_boiler: DiematicBoiler, catalog: RegisterCatalog
+) -> list[DiematicBoilerSchedule]:
+    """Return a schedule per circuit with the days the boiler has a program for."""
     return [
-        b
-        for sub in config
-        if "type" in list(sub) and "bits" in list(sub) and sub["type"] == "bits"
-        for b in sub["bits"]
+        DiematicBoilerSchedule(
+            diematic_boiler.coordinator,
+            boiler_key,
+            circuit,
+            [
+                day_of_week
+                for day_of_week in DAYS_OF_WEEK
+                if catalog.has_schedule(circuit, day_of_week)
+            ],
+        )
+        for circuit in CIRCUITS
     ]
-
-
-def _process_circuit(
-    circuit: str,
-    boiler_key: str,
-    bitstypes: list[str],
-    diematic_data: dict[str, Any],
-) -> DiematicBoilerSchedule:
-    """Process a circuit and prepare DiematicBolierSchedule."""
-    scheduler_config = {}
-    scheduler_config["name"] = f"Scheduler {circuit}"
-    scheduler_config["id"] = f"scheduler_{circuit}_{boiler_key}"
-    for day_of_week in (
-        "monday",
-        "tuesday",
-        "wednesday",
-        "thursday",
-        "friday",
-        "saturday",
-        "sunday",
-    ):
-        varname = f"{day_of_week}_{circuit}"
-        varnamein = varname + "_0000_0030" in bitstypes
-        if varnamein:
-            scheduler_config[day_of_week] = []
-            _prepare_day_block(scheduler_config[day_of_week], varname, diematic_data)
-
-    return DiematicBoilerSchedule(scheduler_config)
-
-
-def _prepare_day_block(
-    day_config: list[Any],
-    varname: str,
-    diematic_data: dict[str, Any],
-) -> None:
-    """Read start - end periods from boiler data about one day and circuit and prepare array value for schedule."""
-    current_block = {}
-    in_range = False
-    for starthour in range(24):
-        for startminute in ("00", "30"):
-            endhour = starthour if startminute == "00" else starthour + 1
-            if endhour == 24:
-                endhour = 0
-            endminute = "00" if startminute == "30" else "30"
-            timevarname = (
-                f"{varname}_{starthour:02}{startminute}_{endhour:02}{endminute}"
-            )
-            if not in_range:
-                if diematic_data[timevarname] == 1:
-                    current_block["from"] = f"{starthour:02}:{startminute}:00"
-                    in_range = True
-            elif diematic_data[timevarname] == 0:
-                current_block["to"] = f"{starthour:02}:{startminute}:00"
-                day_config.append(current_block)
-                current_block = {}
-                in_range = False
-
-    if in_range:
-        current_block["to"] = "24:00:00"
-        day_config.append(current_block)
@@ -0,0 +1,100 @@
+"""Conversions of the half hour day programs stored in the boiler.
+
+A day program is held by the boiler as 48 bits named
+``{day_of_week}_{circuit}_{start}_{end}``. Here it is handled as one integer
+where bit 47 is the slot starting at 00:00 and bit 0 the slot starting at 23:30.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any
+
+SLOTS_PER_DAY = 48
+FULL_DAY = (1 << SLOTS_PER_DAY) - 1
+
+
+def _slot_suffix(slot: int) -> str:
+    """Return the start_end suffix of a slot variable."""
+    start = slot * 30
+    end = (start + 30) % (24 * 60)
+    return f"{start // 60:02}{start % 60:02}_{end // 60:02}{end % 60:02}"
+
+
+SLOT_SUFFIXES: tuple[str, ...] = tuple(_slot_suffix(slot) for slot in range(48))
+SLOT_TIMES: tuple[str, ...] = tuple(
+    f"{slot // 2:02}:{slot % 2 * 30:02}:00" for slot in range(48)
+) + ("24:00:00",)
+_SLOT_SUFFIX_SET = frozenset(SLOT_SUFFIXES)
+_TIME_SLOTS = {time[:5]: slot for slot, time in enumerate(SLOT_TIMES)}
+
+
+@lru_cache(maxsize=64)
+def slot_names(varname: str) -> tuple[str, ...]:
+    """Return the 48 variable names of a day program, first slot first."""
+    return tuple(f"{varname}_{suffix}" for suffix in SLOT_SUFFIXES)
+
+
+def is_slot_name(name: str) -> bool:
+    """Return True if the variable is one bit of a day program."""
+    return name[-9:] in _SLOT_SUFFIX_SET
+
+
+def bitmap_from_variables(varname: str, variables: Mapping[str, Any]) -> int:
+    """Pack the slot variables of a day program into a bitmap."""
+    # Snapshots already hold the day programs packed
+    day_bitmap = getattr(variables, "day_bitmap", None)
+    if day_bitmap is not None and (bitmap := day_bitmap(varname)) is not None:
+        return bitmap
+
+    bitmap = 0
+    for name in slot_names(varname):
+        bitmap = (bitmap << 1) | (1 if variables[name] else 0)
+    return bitmap
+
+
+def bitmap_to_variables(varname: str, bitmap: int) -> dict[str, int]:
+    """Unpack a bitmap into the slot variables of a day program."""
+    return {
+        name: (bitmap >> (SLOTS_PER_DAY - 1 - slot)) & 1
+        for slot, name in enumerate(slot_names(varname))
+    }
+
+
+def changed_slots(varname: str, old_bitmap: int, new_bitmap: int) -> dict[str, int]:
+    """Return only the slot variables that differ between two bitmaps."""
+    names = slot_names(varname)
+    changed = {}
+    diff = (old_bitmap ^ new_bitmap) & FULL_DAY
+    while diff:
+        bit = diff.bit_length() - 1
+        changed[names[SLOTS_PER_DAY - 1 - bit]] = (new_bitmap >> bit) & 1
+        diff &= ~(1 << bit)
+    return changed
+
+
+def bitmap_to_ranges(bitmap: int) -> list[dict[str, str]]:
+    """Convert a bitmap into the from / to periods used by schedules."""
+    ranges = []
+    slot = 0
+    while slot < SLOTS_PER_DAY:
+        if not (bitmap >> (SLOTS_PER_DAY - 1 - slot)) & 1:
+            slot += 1
+            continue
+        start = slot
+        while slot < SLOTS_PER_DAY and (bitmap >> (SLOTS_PER_DAY - 1 - slot)) & 1:
+            slot += 1
+        ranges.append({"from": SLOT_TIMES[start], "to": SLOT_TIMES[slot]})
+    return ranges
+
+
+def bitmap_from_ranges(ranges: list[Mapping[str, Any]]) -> int:
+    """Convert from / to periods, aligned to half hours, into a bitmap."""
+    bitmap = 0
+    for period in ranges:
+        start = _TIME_SLOTS[str(period["from"])[:5]]
+        end = _TIME_SLOTS[str(period["to"])[:5]]
+        for slot in range(start, end):
+            bitmap |= 1 << (SLOTS_PER_DAY - 1 - slot)
+    return bitmap
@@ -2,14 +2,39 @@
 
 from __future__ import annotations
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE, UnitOfTemperature, UnitOfTime
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import dt as dt_util
 
+from .aggregators import DailyStatistics, OnTime
 from .const import DOMAIN
 from .diematic_bolier import DiematicBoiler
-from .entity import DiematicEntity
+from .entity import DiematicEntity, async_setup_catalog_entities
+from .register_catalog import RegisterCatalog
+
+PUMPS = {
+    "io_circ_a_pump_on": "Pump circuit a",
+    "io_circ_b_pump_on": "Pump circuit b",
+    "io_circ_c_pump_on": "Pump circuit c",
+    "io_boiler_pump": "Boiler Pump",
+    "io_dhw_pump_on": "DHW Pump",
+    "io_aux_pump_1_on": "Aux 1 Pump",
+    "io_aux_pump_2_on": "Aux 2 Pump",
+    "io_aux_pump_3_on": "Aux 3 Pump",
+    "io_secondary_pump": "Secondary Pump",
+}
+DAILY_STATISTICS = ("minimum", "maximum", "mean")
+SECONDS_PER_DAY = 24 * 3600
 
 
 async def async_setup_entry(
@@ -22,36 +47,66 @@ async def async_setup_entry(
     if (unique_id := entry.unique_id) is None:
         unique_id = entry.unique_id
 
-    config = await diematic_boiler.boiler_config()
-
     sensors: list[SensorEntity] = []
     sensors.append(DiematicBoilerSensor(entry.entry_id, unique_id, diematic_boiler))
+    sensors.append(
+        DiematicRequestLatencySensor(entry.entry_id, unique_id, diematic_boiler)
+    )
+    sensors.append(
+        DiematicRequestErrorRateSensor(entry.entry_id, unique_id, diematic_boiler)
+    )
+    async_add_entities(sensors)
 
-    sensors.extend(
-        DiematicBoilerTempSensor(
-            entry_id=entry.entry_id,
-            unique_id=unique_id,
-            diematic_boiler=diematic_boiler,
-            variable=cal["name"],
-            name=cal["desc"],
-        )
-        for cal in config
-        if (
-            "ha" in list(cal)
-            and cal["ha"]
-            and "unit" in list(cal)
-            and (
-                cal["unit"] == "CelsiusTemperature"
-                or cal["unit"] == "°C"
-                or cal["unit"] == "K"
+    def temperature_sensors(catalog: RegisterCatalog) -> list[SensorEntity]:
+        """Return a sensor per readonly temperature register."""
+        return [
+            DiematicBoilerTempSensor(
+                entry_id=entry.entry_id,
+                unique_id=unique_id,
+                diematic_boiler=diematic_boiler,
+                variable=cal["name"],
+                name=cal["desc"],
             )
-            and "step" not in list(cal)
-            and "max" not in list(cal)
-            and "min" not in list(cal)
-        )
+            for cal in catalog.temperature_sensors()
+        ]
+
+    await async_setup_catalog_entities(
+        hass, entry, diematic_boiler, async_add_entities, temperature_sensors
     )
 
-    async_add_entities(sensors, True)
+    def aggregate_sensors(catalog: RegisterCatalog) -> list[SensorEntity]:
+        """Return the runtime of the pumps and the daily statistics of temperatures."""
+        aggregates: list[SensorEntity] = []
+        for variable, name in PUMPS.items():
+            if variable not in catalog:
+                continue
+            aggregates.append(
+                DiematicRuntimeSensor(
+                    entry.entry_id, unique_id, diematic_boiler, variable, name
+                )
+            )
+            aggregates.append(
+                DiematicDutyCycleSensor(
+                    entry.entry_id, unique_id, diematic_boiler, variable, name
+                )
+            )
+        aggregates.extend(
+            DiematicDailyStatisticSensor(
+                entry.entry_id,
+                unique_id,
+                diematic_boiler,
+                cal["name"],
+                cal["desc"],
+                statistic,
+            )
+            for cal in catalog.temperature_sensors()
+            for statistic in DAILY_STATISTICS
+        )
+        return aggregates
+
+    await async_setup_catalog_entities(
+        hass, entry, diematic_boiler, async_add_entities, aggregate_sensors
+    )
 
 
 class DiematicSensor(DiematicEntity, SensorEntity):
@@ -68,6 +123,7 @@ class DiematicSensor(DiematicEntity, SensorEntity):
         key: str,
         name: str,
         unit_of_measurement: str | None = None,
+        variables: tuple[str, ...] | None = None,
     ) -> None:
         """Initialize Diematic sensor."""
         self._key = key
@@ -81,6 +137,7 @@ class DiematicSensor(DiematicEntity, SensorEntity):
             name=name,
             icon=icon,
             enabled_default=enabled_default,
+            variables=variables,
         )
 
 
@@ -99,6 +156,7 @@ class DiematicBoilerSensor(DiematicSensor):
             key="boiler",
             name=diematic_boiler.coordinator.data.info.name,
             unit_of_measurement=None,
+            variables=("error",),
         )
 
     @property
@@ -129,9 +187,238 @@ class DiematicBoilerTempSensor(DiematicSensor):
             key=variable,
             name=name,
             unit_of_measurement="°C",
+            variables=(variable,),
         )
 
     @property
     def native_value(self) -> int:
         """Obtain the native value."""
         return self.coordinator.data.variables[self.variable]
+
+
+class DiematicRequestLatencySensor(DiematicSensor):
+    """Defines a sensor with the recent latency of the boiler polls."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self, entry_id: str, unique_id: str, diematic_boiler: DiematicBoiler
+    ) -> None:
+        """Initialize a DiematicRequestLatencySensor."""
+        super().__init__(
+            diematic_boiler=diematic_boiler,
+            enabled_default=False,
+            entry_id=entry_id,
+            unique_id=unique_id,
+            icon="mdi:timer-outline",
+            key="request_latency",
+            name="Request latency",
+            unit_of_measurement=UnitOfTime.MILLISECONDS,
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the moving average latency of the boiler reads."""
+        if (stats := self._diematic_boiler.stats.polls) is None:
+            return None
+        return round(stats.ewma_ms, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the latency histogram of the boiler reads."""
+        if (stats := self._diematic_boiler.stats.polls) is None:
+            return None
+        return stats.as_dict()
+
+
+class DiematicRequestErrorRateSensor(DiematicSensor):
+    """Defines a sensor with the share of failed daemon requests."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self, entry_id: str, unique_id: str, diematic_boiler: DiematicBoiler
+    ) -> None:
+        """Initialize a DiematicRequestErrorRateSensor."""
+        super().__init__(
+            diematic_boiler=diematic_boiler,
+            enabled_default=False,
+            entry_id=entry_id,
+            unique_id=unique_id,
+            icon="mdi:alert-circle-outline",
+            key="request_error_rate",
+            name="Request error rate",
+            unit_of_measurement=PERCENTAGE,
+        )
+
+    @property
+    def native_value(self) -> float:
+        """Return the percentage of requests that failed."""
+        return round(self._diematic_boiler.stats.totals.error_rate * 100, 2)
+
+
+class DiematicRuntimeSensor(DiematicSensor):
+    """Defines a sensor with the total running time of a pump."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(
+        self,
+        entry_id: str,
+        unique_id: str,
+        diematic_boiler: DiematicBoiler,
+        variable: str,
+        name: str,
+    ) -> None:
+        """Initialize a DiematicRuntimeSensor."""
+        self.variable = variable
+        self._on_time: OnTime | None = None
+        # Updated on every poll, the running time grows while the pump stays on
+        super().__init__(
+            diematic_boiler=diematic_boiler,
+            enabled_default=False,
+            entry_id=entry_id,
+            unique_id=unique_id,
+            icon="mdi:timer-cog-outline",
+            key=f"{variable}_runtime",
+            name=f"{name} runtime",
+            unit_of_measurement=UnitOfTime.HOURS,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Start aggregating the pump state."""
+        self._on_time = self.coordinator.aggregates.on_time(self.variable)
+        await super().async_added_to_hass()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop aggregating the pump state unless another entity uses it."""
+        await super().async_will_remove_from_hass()
+        self.coordinator.aggregates.release_on_time(self.variable)
+
+    @property
+    def native_value(self) -> float:
+        """Return the hours the pump has been running."""
+        return round(self._on_time.total_s / 3600, 2)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the running time of today and yesterday and the starts."""
+        yesterday_s = self._on_time.yesterday_s
+        return {
+            "today_hours": round(self._on_time.today_s / 3600, 2),
+            "yesterday_hours": round(yesterday_s / 3600, 2)
+            if yesterday_s is not None
+            else None,
+            "starts": self._on_time.starts,
+        }
+
+
+class DiematicDutyCycleSensor(DiematicSensor):
+    """Defines a sensor with the share of today a pump has been running."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        entry_id: str,
+        unique_id: str,
+        diematic_boiler: DiematicBoiler,
+        variable: str,
+        name: str,
+    ) -> None:
+        """Initialize a DiematicDutyCycleSensor."""
+        self.variable = variable
+        self._on_time: OnTime | None = None
+        super().__init__(
+            diematic_boiler=diematic_boiler,
+            enabled_default=False,
+            entry_id=entry_id,
+            unique_id=unique_id,
+            icon="mdi:percent-circle-outline",
+            key=f"{variable}_duty_cycle",
+            name=f"{name} duty cycle",
+            unit_of_measurement=PERCENTAGE,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Start aggregating the pump state."""
+        self._on_time = self.coordinator.aggregates.on_time(self.variable)
+        await super().async_added_to_hass()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop aggregating the pump state unless another entity uses it."""
+        await super().async_will_remove_from_hass()
+        self.coordinator.aggregates.release_on_time(self.variable)
+
+    @property
+    def native_value(self) -> float:
+        """Return the percentage of today the pump has been running."""
+        return round(self._on_time.duty_cycle(dt_util.now()) * 100, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the duty cycle of yesterday."""
+        yesterday_s = self._on_time.yesterday_s
+        return {
+            "yesterday": round(yesterday_s / SECONDS_PER_DAY * 100, 1)
+            if yesterday_s is not None
+            else None,
+        }
+
+
+class DiematicDailyStatisticSensor(DiematicSensor):
+    """Defines a sensor with the minimum, maximum or mean of a temperature today."""
+
+    _attr_device_class = SensorDeviceClass.TEMPERATURE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        entry_id: str,
+        unique_id: str,
+        diematic_boiler: DiematicBoiler,
+        variable: str,
+        name: str,
+        statistic: str,
+    ) -> None:
+        """Initialize a DiematicDailyStatisticSensor."""
+        self.variable = variable
+        self.statistic = statistic
+        self._statistics: DailyStatistics | None = None
+        super().__init__(
+            diematic_boiler=diematic_boiler,
+            enabled_default=False,
+            entry_id=entry_id,
+            unique_id=unique_id,
+            icon="mdi:thermometer-lines",
+            key=f"{variable}_daily_{statistic}",
+            name=f"{name} daily {statistic}",
+            unit_of_measurement=UnitOfTemperature.CELSIUS,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Start aggregating the temperature."""
+        self._statistics = self.coordinator.aggregates.daily_statistics(self.variable)
+        await super().async_added_to_hass()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop aggregating the temperature unless another entity uses it."""
+        await super().async_will_remove_from_hass()
+        self.coordinator.aggregates.release_daily_statistics(self.variable)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the statistic of today."""
+        value = getattr(self._statistics, self.statistic)
+        return round(value, 1) if value is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the statistic of yesterday."""
+        yesterday = self._statistics.yesterday or {}
+        value = yesterday.get(self.statistic)
+        return {"yesterday": round(value, 1) if value is not None else None}
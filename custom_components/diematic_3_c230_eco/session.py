@@ -0,0 +1,14 @@
+"""HTTP session shared by the clients talking to the same diematic daemon."""
+
+from __future__ import annotations
+
+from aiohttp import ClientSession
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+
+@callback
+def async_get_daemon_session(hass: HomeAssistant, verify_ssl: bool) -> ClientSession:
+    """Return the Home Assistant session, pooling keep-alive connections for every entry."""
+    return async_get_clientsession(hass, verify_ssl)
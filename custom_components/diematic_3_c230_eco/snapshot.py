@@ -0,0 +1,213 @@
+"""Compact read only representation of the boiler variables.
+
+Most boiler variables are single bits of the half hour day programs. A
+snapshot keeps them packed in one integer per day program, with a second
+integer telling which bits were reported, and the remaining registers in a
+list indexed through a layout shared by every snapshot of the same boiler.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+from .schedule_engine import (
+    FULL_DAY,
+    SLOT_SUFFIXES,
+    SLOTS_PER_DAY,
+    is_slot_name,
+    slot_names,
+)
+
+_SHIFTS = {
+    suffix: SLOTS_PER_DAY - 1 - slot for slot, suffix in enumerate(SLOT_SUFFIXES)
+}
+_MISSING = object()
+
+
+class SnapshotLayout:
+    """Positions of the boiler variables inside a snapshot."""
+
+    __slots__ = ("slots", "days", "day_bits")
+
+    def __init__(self, names: Iterable[str]) -> None:
+        """Initialize the layout for the given variable names."""
+        # register name -> index in the values
+        self.slots: dict[str, int] = {}
+        # day program name -> index in the packed days
+        self.days: dict[str, int] = {}
+        # slot name -> (index in the packed days, bit)
+        self.day_bits: dict[str, tuple[int, int]] = {}
+        for name in names:
+            if is_slot_name(name):
+                day = self.days.setdefault(name[:-10], len(self.days))
+                self.day_bits[name] = (day, _SHIFTS[name[-9:]])
+            else:
+                self.slots.setdefault(name, len(self.slots))
+
+    def covers(self, names: Iterable[str]) -> bool:
+        """Return True if every name has a position in this layout."""
+        return all(name in self.slots or name in self.day_bits for name in names)
+
+
+class BoilerSnapshot(Mapping[str, Any]):
+    """Boiler variables stored by position, read through the mapping interface."""
+
+    __slots__ = ("layout", "_values", "_bits", "_present", "_extra")
+
+    def __init__(
+        self,
+        layout: SnapshotLayout,
+        values: list[Any],
+        bits: list[int],
+        present: list[int],
+        extra: dict[str, Any],
+    ) -> None:
+        """Initialize a snapshot, use from_variables or merge instead."""
+        self.layout = layout
+        self._values = values
+        self._bits = bits
+        self._present = present
+        # variables unknown to the layout or day program bits that are not 0 / 1
+        self._extra = extra
+
+    @classmethod
+    def from_variables(
+        cls, layout: SnapshotLayout, variables: Mapping[str, Any]
+    ) -> BoilerSnapshot:
+        """Return the snapshot of a dictionary of variables."""
+        days = len(layout.days)
+        snapshot = cls(
+            layout, [_MISSING] * len(layout.slots), [0] * days, [0] * days, {}
+        )
+        snapshot._update(variables)
+        return snapshot
+
+    def merge(self, variables: Mapping[str, Any]) -> BoilerSnapshot:
+        """Return a new snapshot with some variables replaced."""
+        snapshot = BoilerSnapshot(
+            self.layout,
+            self._values.copy(),
+            self._bits.copy(),
+            self._present.copy(),
+            self._extra.copy(),
+        )
+        snapshot._update(variables)
+        return snapshot
+
+    def day_bitmap(self, varname: str) -> int | None:
+        """Return the bitmap of a day program, None unless every slot is known."""
+        day = self.layout.days.get(varname)
+        if day is None or self._present[day] != FULL_DAY:
+            return None
+        return self._bits[day]
+
+    def changed_keys(self, other: BoilerSnapshot) -> set[str] | None:
+        """Return the variables that differ from other, None if layouts differ."""
+        if other.layout is not self.layout:
+            return None
+
+        values, other_values = self._values, other._values
+        changed = {
+            name
+            for name, index in self.layout.slots.items()
+            if values[index] != other_values[index]
+        }
+        for varname, day in self.layout.days.items():
+            diff = (self._bits[day] ^ other._bits[day]) | (
+                self._present[day] ^ other._present[day]
+            )
+            if not diff:
+                continue
+            names = slot_names(varname)
+            while diff:
+                bit = diff.bit_length() - 1
+                changed.add(names[SLOTS_PER_DAY - 1 - bit])
+                diff &= ~(1 << bit)
+        if self._extra or other._extra:
+            changed.update(
+                name
+                for name in self._extra.keys() | other._extra.keys()
+                if self._extra.get(name, _MISSING) != other._extra.get(name, _MISSING)
+            )
+        return changed
+
+    def _update(self, variables: Mapping[str, Any]) -> None:
+        """Store variables in place, only while the snapshot is being built."""
+        slots = self.layout.slots
+        day_bits = self.layout.day_bits
+        for name, value in variables.items():
+            if (index := slots.get(name)) is not None:
+                self._values[index] = value
+            elif (position := day_bits.get(name)) is not None:
+                day, shift = position
+                mask = 1 << shift
+                if value in (0, 1):
+                    self._present[day] |= mask
+                    if value:
+                        self._bits[day] |= mask
+                    else:
+                        self._bits[day] &= ~mask
+                    self._extra.pop(name, None)
+                else:
+                    self._present[day] &= ~mask
+                    self._bits[day] &= ~mask
+                    self._extra[name] = value
+            else:
+                self._extra[name] = value
+
+    def __getitem__(self, name: str) -> Any:
+        """Return the value of a variable."""
+        if (index := self.layout.slots.get(name)) is not None:
+            if (value := self._values[index]) is not _MISSING:
+                return value
+        elif (position := self.layout.day_bits.get(name)) is not None:
+            day, shift = position
+            if (self._present[day] >> shift) & 1:
+                return (self._bits[day] >> shift) & 1
+        return self._extra[name]
+
+    def __contains__(self, name: object) -> bool:
+        """Return True if the variable has a value."""
+        if (index := self.layout.slots.get(name)) is not None:
+            return self._values[index] is not _MISSING
+        if (position := self.layout.day_bits.get(name)) is not None:
+            day, shift = position
+            if (self._present[day] >> shift) & 1:
+                return True
+        return name in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the names of the variables with a value."""
+        for name, index in self.layout.slots.items():
+            if self._values[index] is not _MISSING:
+                yield name
+        for name, (day, shift) in self.layout.day_bits.items():
+            if (self._present[day] >> shift) & 1:
+                yield name
+        yield from self._extra
+
+    def __len__(self) -> int:
+        """Return the number of variables with a value."""
+        return (
+            sum(value is not _MISSING for value in self._values)
+            + sum(present.bit_count() for present in self._present)
+            + len(self._extra)
+        )
+
+    def __eq__(self, other: object) -> bool:
+        """Compare by position when both snapshots share the layout."""
+        if isinstance(other, BoilerSnapshot) and other.layout is self.layout:
+            return (
+                self._values == other._values
+                and self._bits == other._bits
+                and self._present == other._present
+                and self._extra == other._extra
+            )
+        return super().__eq__(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Return the representation of the variables."""
+        return f"BoilerSnapshot({dict(self)!r})"
@@ -0,0 +1,62 @@
+"""Persistence of the last boiler snapshot, configuration and aggregates of an entry."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from diematic_client import Boiler
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DiematicStore:
+    """Last good snapshot, register descriptor and aggregates saved between restarts."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store of an entry."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}"
+        )
+
+    async def async_load(self) -> tuple[Boiler, list, dict[str, Any]] | None:
+        """Return the saved snapshot, configuration and aggregates, or None."""
+        data = await self._store.async_load()
+        if not data or not data.get("config") or not data.get("variables"):
+            return None
+        try:
+            boiler = Boiler.from_dict({"uuid": data["uuid"], **data["variables"]})
+        except (KeyError, TypeError) as error:
+            _LOGGER.warning("Ignoring unreadable boiler cache: %s", error)
+            return None
+        return boiler, data["config"], data.get("aggregates", {})
+
+    @callback
+    def async_schedule_save(self, data_func: Callable[[], dict[str, Any]]) -> None:
+        """Save the data returned by data_func after a delay, merging frequent calls."""
+        self._store.async_delay_save(data_func, SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Remove the saved data."""
+        await self._store.async_remove()
+
+
+def boiler_to_dict(
+    boiler: Boiler, config: list, aggregates: dict[str, Any]
+) -> dict[str, Any]:
+    """Return the serializable form of a snapshot, its configuration and aggregates."""
+    return {
+        "uuid": boiler.info.uuid,
+        "variables": dict(boiler.variables),
+        "config": config,
+        "aggregates": aggregates,
+    }
@@ -0,0 +1,108 @@
+"""Push updates streamed by the diematic daemon."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import json
+import logging
+from typing import TYPE_CHECKING
+
+import aiohttp
+from yarl import URL
+
+from homeassistant.core import HomeAssistant, callback
+
+if TYPE_CHECKING:
+    from .diematic_bolier import DiematicBoiler
+
+STREAM_PATH = "events"
+RECONNECT_DELAY = timedelta(seconds=5)
+MAX_RECONNECT_DELAY = timedelta(minutes=5)
+# The daemon sends a keepalive comment well within this time, a silent
+# connection is half-open and treated as dropped
+STREAM_READ_TIMEOUT = timedelta(seconds=90)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DiematicBoilerStream:
+    """Server-sent events subscription feeding register deltas to the coordinator."""
+
+    def __init__(self, hass: HomeAssistant, diematic_boiler: DiematicBoiler) -> None:
+        """Initialize the stream of a boiler."""
+        self._hass = hass
+        self._diematic_boiler = diematic_boiler
+        self._task: asyncio.Task | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start listening to the daemon in background."""
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(
+                self._async_listen_loop(), "diematic push stream"
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop listening to the daemon."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._diematic_boiler.coordinator.async_set_push_active(False)
+
+    async def _async_listen_loop(self) -> None:
+        """Keep the subscription open, polling covers the time it is down."""
+        coordinator = self._diematic_boiler.coordinator
+        delay = RECONNECT_DELAY
+        while True:
+            try:
+                await self._async_listen()
+            except asyncio.TimeoutError:
+                _LOGGER.debug(
+                    "Diematic push stream silent for %s, reconnecting",
+                    STREAM_READ_TIMEOUT,
+                )
+            except (aiohttp.ClientError, ValueError) as error:
+                _LOGGER.debug("Diematic push stream failed: %s", error)
+            if coordinator.push_active:
+                # The stream was up, reconnect quickly
+                delay = RECONNECT_DELAY
+            coordinator.async_set_push_active(False)
+            await asyncio.sleep(delay.total_seconds())
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    async def _async_listen(self) -> None:
+        """Read events until the daemon closes the stream."""
+        client = self._diematic_boiler.boiler_client
+        auth = None
+        if client.username and client.password:
+            auth = aiohttp.BasicAuth(client.username, client.password)
+        async with self._diematic_boiler.session.get(
+            URL(client.diematic_uri).join(URL(STREAM_PATH)),
+            auth=auth,
+            headers={"Accept": "text/event-stream", "User-Agent": client.user_agent},
+            ssl=client.verify_ssl,
+            timeout=aiohttp.ClientTimeout(
+                total=None, sock_read=STREAM_READ_TIMEOUT.total_seconds()
+            ),
+        ) as response:
+            response.raise_for_status()
+            self._diematic_boiler.coordinator.async_set_push_active(True)
+            data: list[str] = []
+            async for raw_line in response.content:
+                line = raw_line.decode("utf-8").rstrip("\r\n")
+                # Comment lines are keepalives, reading them resets the timeout
+                if line.startswith("data:"):
+                    data.append(line[5:].lstrip())
+                elif not line and data:
+                    self._async_handle_event(json.loads("\n".join(data)))
+                    data = []
+
+    @callback
+    def _async_handle_event(self, delta: dict) -> None:
+        """Merge the registers received into the current boiler data."""
+        coordinator = self._diematic_boiler.coordinator
+        if coordinator.data is None or not isinstance(delta, dict):
+            return
+        coordinator.async_set_updated_data(coordinator.merged(delta))
@@ -2,22 +2,18 @@
 
 from __future__ import annotations
 
-import asyncio
-import logging
 from typing import Any
 
-from diematic_client import DiematicError, DiematicStatus
-
 from homeassistant.components.timer_programmer import TimerProgrammerEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .const import CIRCUITS, DAYS_OF_WEEK, DOMAIN
 from .diematic_bolier import DiematicBoiler
 from .entity import DiematicEntity
-
-_LOGGER = logging.getLogger(__name__)
+from .schedule_engine import bitmap_from_variables, changed_slots, slot_names
+from .write_queue import PRIORITY_SCHEDULE
 
 
 async def async_setup_entry(
@@ -31,31 +27,15 @@ async def async_setup_entry(
     if (unique_id := config_entry.unique_id) is None:
         unique_id = config_entry.unique_id
 
-    config = await diematic_boiler.boiler_config()
+    catalog = await diematic_boiler.register_catalog()
 
     timer_programmers: list[TimerProgrammerEntity] = []
 
-    bitstypes = [
-        bit
-        for sub in config
-        if "type" in list(sub) and "bits" in list(sub) and sub["type"] == "bits"
-        for bit in sub["bits"]
-    ]
-
-    for circuit in ("a", "b", "c", "acs"):
+    for circuit in CIRCUITS:
         week_timer_programmers: list[TimerProgrammerEntity] = []
-        for day_of_week in (
-            "monday",
-            "tuesday",
-            "wednesday",
-            "thursday",
-            "friday",
-            "saturday",
-            "sunday",
-        ):
+        for day_of_week in DAYS_OF_WEEK:
             varname = f"{day_of_week}_{circuit}"
-            varnamein = varname + "_0000_0030" in bitstypes
-            if varnamein:
+            if catalog.has_schedule(circuit, day_of_week):
                 timer_programmer = DiematicBoilerConfortTimerProgrammer(
                     config_entry.entry_id,
                     unique_id,
@@ -77,7 +57,7 @@ async def async_setup_entry(
                 )
             )
 
-    async_add_entities(timer_programmers, True)
+    async_add_entities(timer_programmers)
 
 
 class DiematicTimerProgrammer(DiematicEntity, TimerProgrammerEntity):
@@ -95,6 +75,7 @@ class DiematicTimerProgrammer(DiematicEntity, TimerProgrammerEntity):
         key: str,
         name: str,
         unit_of_measurement: str | None = None,
+        variables: list[str] | None = None,
     ) -> None:
         """Initialize Diematic sensor."""
         self._key = key
@@ -109,82 +90,19 @@ class DiematicTimerProgrammer(DiematicEntity, TimerProgrammerEntity):
             name=name,
             icon=icon,
             enabled_default=enabled_default,
+            variables=variables if variables is not None else slot_names(varname),
         )
 
     @property
     def value(self) -> int:
         """Obtain the value."""
-        bitsvalue = 0
-        i = 47
-        for starthour in range(24):
-            for startminute in ("00", "30"):
-                endhour = starthour if startminute == "00" else starthour + 1
-                if endhour == 24:
-                    endhour = 0
-                endminute = "00" if startminute == "30" else "30"
-                varname = f"{self.varname}_{starthour:02}{startminute}_{endhour:02}{endminute}"
-                bitsvalue |= (1 if self.coordinator.data.variables[varname] else 0) << i
-                i -= 1
-
-        return bitsvalue
+        return bitmap_from_variables(self.varname, self.coordinator.variables)
 
     async def async_set_value(self, value: int) -> None:
         """Set the value async."""
-        i = 47
-        for starthour in range(24):
-            for startminute in ("00", "30"):
-                endhour = starthour if startminute == "00" else starthour + 1
-                if endhour == 24:
-                    endhour = 0
-                endminute = "00" if startminute == "30" else "30"
-                varname = f"{self.varname}_{starthour:02}{startminute}_{endhour:02}{endminute}"
-                checkvalue = (value & 2**i) >> i
-                if self.coordinator.data.variables[varname] != checkvalue:
-                    await self._async_write_register_value(varname, checkvalue)
-                i -= 1
-
-    async def _async_write_register_value(
-        self, variable: str, write_value: int, wait_confirmation=True
-    ):
-        try:
-            result = await self._diematic_boiler.update_boiler_register(
-                variable, write_value
-            )
-            if result == DiematicStatus.OK:
-                if wait_confirmation:
-                    await self.async_read_confirm_value(variable, write_value)
-            else:
-                _LOGGER.error(
-                    "Setting parameter value '%s' returned error but no additional information",
-                    variable,
-                )
-        except DiematicError as error:
-            _LOGGER.error(
-                "Error setting parameter '%s' value to diematic boiler: {%s}",
-                variable,
-                error,
-            )
-
-    async def async_read_confirm_value(self, variable: str, write_value: int):
-        """Read register value until matches write_value or timeout happens."""
-        i = 0
-        while i < 20:
-            i += 1
-            readresult = await self._diematic_boiler.read_boiler_register(variable)
-            if (
-                "status" in readresult
-                and readresult["status"] == "read"
-                and readresult["value"] == write_value
-            ):
-                self.async_schedule_update_ha_state(True)
-                break
-            await asyncio.sleep(1)
-        if i >= 20:
-            _LOGGER.warning(
-                "Timeout setting value '%s' to register '%s'",
-                write_value,
-                variable,
-            )
+        await self._async_write_values(
+            changed_slots(self.varname, self.value, value), PRIORITY_SCHEDULE
+        )
 
     async def async_turn_on(self, bit: int, **kwargs: Any) -> None:
         """Turn on specific bit and write register to boiler."""
@@ -248,47 +166,26 @@ class DiematicBoilerConfortGroupTimerProgrammer(DiematicTimerProgrammer):
             key=f"confort_group_{circuit}",
             name=f"Confort {circuit}",
             unit_of_measurement=None,
+            variables=[
+                name
+                for timer_programmer in timer_programmers
+                for name in slot_names(timer_programmer.varname)
+            ],
         )
 
     @property
     def value(self) -> int:
         """Obtain the value."""
         bitsvalue = 0
-        i = 47
-        for starthour in range(24):
-            for startminute in ("00", "30"):
-                endhour = starthour if startminute == "00" else starthour + 1
-                if endhour == 24:
-                    endhour = 0
-                endminute = "00" if startminute == "30" else "30"
-                for timer_programmer in self._timer_programmers:
-                    varname = f"{timer_programmer.varname}_{starthour:02}{startminute}_{endhour:02}{endminute}"
-                    bitsvalue |= (
-                        1 if self.coordinator.data.variables[varname] else 0
-                    ) << i
-                i -= 1
-
+        for timer_programmer in self._timer_programmers:
+            bitsvalue |= timer_programmer.value
         return bitsvalue
 
     async def async_set_value(self, value: int) -> None:
         """Set the value async."""
-        i = 47
-        for starthour in range(24):
-            for startminute in ("00", "30"):
-                endhour = starthour if startminute == "00" else starthour + 1
-                if endhour == 24:
-                    endhour = 0
-                endminute = "00" if startminute == "30" else "30"
-                for timer_programmer in self._timer_programmers:
-                    varname = f"{timer_programmer.varname}_{starthour:02}{startminute}_{endhour:02}{endminute}"
-                    checkvalue = (value & 2**i) >> i
-                    if self.coordinator.data.variables[varname] != checkvalue:
-                        await self._async_write_register_value(
-                            varname, checkvalue, wait_confirmation=False
-                        )
-                for timer_programmer in self._timer_programmers:
-                    varname = f"{timer_programmer.varname}_{starthour:02}{startminute}_{endhour:02}{endminute}"
-                    checkvalue = (value & 2**i) >> i
-                    if self.coordinator.data.variables[varname] != checkvalue:
-                        await self.async_read_confirm_value(varname, checkvalue)
-                i -= 1
+        values = {}
+        for timer_programmer in self._timer_programmers:
+            values.update(
+                changed_slots(timer_programmer.varname, timer_programmer.value, value)
+            )
+        await self._async_write_values(values, PRIORITY_SCHEDULE)
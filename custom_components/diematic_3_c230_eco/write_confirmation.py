@@ -0,0 +1,122 @@
+"""Confirmation of the values written to the boiler registers."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import timedelta
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+
+if TYPE_CHECKING:
+    from .coordinator import DiematicCoordinator
+
+CONFIRM_INTERVAL = timedelta(seconds=2)
+CONFIRM_TIMEOUT = timedelta(seconds=40)
+
+
+@dataclass
+class PendingWrite:
+    """A value written to a register and not yet reported by the boiler."""
+
+    value: Any
+    deadline: float
+    futures: list[asyncio.Future[bool]] = field(default_factory=list)
+
+    def resolve(self, confirmed: bool) -> None:
+        """Resolve every waiter of this write."""
+        for future in self.futures:
+            if not future.done():
+                future.set_result(confirmed)
+
+
+class WriteConfirmations:
+    """Track pending writes and confirm all of them with one read per cycle."""
+
+    def __init__(self, hass: HomeAssistant, coordinator: DiematicCoordinator) -> None:
+        """Initialize the write confirmations of a boiler."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._pending: dict[str, PendingWrite] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> bool:
+        """Return True while some write waits for confirmation."""
+        return bool(self._pending)
+
+    @property
+    def parameters(self) -> set[str]:
+        """Return the registers waiting for confirmation."""
+        return set(self._pending)
+
+    @callback
+    def async_track(self, parameter: str, value: Any) -> asyncio.Future[bool]:
+        """Start tracking a write, superseding any pending write to the same register."""
+        future: asyncio.Future[bool] = self._hass.loop.create_future()
+        pending = PendingWrite(
+            value, time.monotonic() + CONFIRM_TIMEOUT.total_seconds()
+        )
+        if (previous := self._pending.get(parameter)) is not None:
+            # Waiters of the superseded write get the outcome of the new one
+            pending.futures.extend(previous.futures)
+        pending.futures.append(future)
+        self._pending[parameter] = pending
+
+        if self._task is None or self._task.done():
+            self._task = self._hass.async_create_background_task(
+                self._async_confirm_loop(), "diematic write confirmation"
+            )
+        return future
+
+    async def async_wait(self, parameters: Iterable[str]) -> set[str]:
+        """Wait for the given writes and return the parameters not confirmed."""
+        futures = {
+            parameter: self._pending[parameter].futures[-1]
+            for parameter in parameters
+            if parameter in self._pending
+        }
+        if futures:
+            await asyncio.wait(futures.values())
+        return {
+            parameter for parameter, future in futures.items() if not future.result()
+        }
+
+    @callback
+    def async_process_variables(self, variables: Mapping[str, Any]) -> None:
+        """Resolve the writes confirmed by a new snapshot of the boiler."""
+        for parameter, pending in list(self._pending.items()):
+            if variables.get(parameter) == pending.value:
+                del self._pending[parameter]
+                pending.resolve(True)
+        self._async_expire()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop confirming and release every waiter."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for pending in self._pending.values():
+            pending.resolve(False)
+        self._pending.clear()
+
+    @callback
+    def _async_expire(self) -> None:
+        """Give up on the writes not confirmed in time."""
+        now = time.monotonic()
+        for parameter, pending in list(self._pending.items()):
+            if pending.deadline <= now:
+                del self._pending[parameter]
+                pending.resolve(False)
+
+    async def _async_confirm_loop(self) -> None:
+        """Refresh the boiler data until every pending write is resolved."""
+        while self._pending:
+            await asyncio.sleep(CONFIRM_INTERVAL.total_seconds())
+            # The coordinator hands the new snapshot to async_process_variables
+            await self._coordinator.async_refresh()
+            self._async_expire()
@@ -0,0 +1,182 @@
+"""Queue of the register writes sent to one boiler."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+import heapq
+import itertools
+import time
+from typing import Any
+
+from diematic_client import DiematicStatus
+
+from homeassistant.core import HomeAssistant, callback
+
+# Lower numbers are written first
+PRIORITY_SETPOINT = 0
+PRIORITY_SCHEDULE = 1
+
+
+@dataclass
+class QueuedWrite:
+    """A register value waiting to be written."""
+
+    value: float | str
+    priority: int
+    sequence: int
+    enqueued: float
+    futures: list[asyncio.Future[DiematicStatus]] = field(default_factory=list)
+
+
+@dataclass
+class WriteQueueStats:
+    """Counters of a write queue."""
+
+    written: int = 0
+    superseded: int = 0
+    failed: int = 0
+    max_depth: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+
+    def as_dict(self, depth: int) -> dict[str, Any]:
+        """Return the counters in a serializable form."""
+        sent = self.written + self.failed
+        return {
+            "depth": depth,
+            "max_depth": self.max_depth,
+            "written": self.written,
+            "superseded": self.superseded,
+            "failed": self.failed,
+            "mean_wait_ms": round(self.total_wait_ms / sent, 1) if sent else None,
+            "max_wait_ms": round(self.max_wait_ms, 1),
+        }
+
+
+class WriteQueue:
+    """Send register writes one at a time, by priority and below a rate limit."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        write: Callable[[str, float | str], Awaitable[DiematicStatus]],
+        rate: float,
+    ) -> None:
+        """Initialize the queue with the function writing one register."""
+        self.hass = hass
+        self._write = write
+        self._interval = 1 / rate
+        self._pending: dict[str, QueuedWrite] = {}
+        self._heap: list[tuple[int, int, str]] = []
+        self._sequence = itertools.count()
+        self._next_write: float = 0.0
+        self._in_flight: str | None = None
+        self._task: asyncio.Task | None = None
+        self.stats = WriteQueueStats()
+
+    @property
+    def depth(self) -> int:
+        """Return the number of registers waiting to be written."""
+        return len(self._pending)
+
+    @property
+    def parameters(self) -> set[str]:
+        """Return the registers queued or being written."""
+        parameters = set(self._pending)
+        if self._in_flight is not None:
+            parameters.add(self._in_flight)
+        return parameters
+
+    async def async_write(
+        self, parameter: str, value: float | str, priority: int = PRIORITY_SETPOINT
+    ) -> DiematicStatus:
+        """Queue a write and return the status of the write that reached the boiler."""
+        future: asyncio.Future[DiematicStatus] = self.hass.loop.create_future()
+        if (queued := self._pending.get(parameter)) is not None:
+            # Only the latest value is written, every caller gets its result
+            self.stats.superseded += 1
+            queued.value = value
+            if priority < queued.priority:
+                queued.priority = priority
+                heapq.heappush(self._heap, (priority, queued.sequence, parameter))
+        else:
+            queued = self._pending[parameter] = QueuedWrite(
+                value, priority, next(self._sequence), time.monotonic()
+            )
+            heapq.heappush(self._heap, (priority, queued.sequence, parameter))
+            self.stats.max_depth = max(self.stats.max_depth, len(self._pending))
+        queued.futures.append(future)
+
+        if self._task is None or self._task.done():
+            self._task = self.hass.async_create_background_task(
+                self._async_run(), "diematic write queue"
+            )
+        return await future
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop writing and cancel the queued writes."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for queued in self._pending.values():
+            for future in queued.futures:
+                future.cancel()
+        self._pending.clear()
+        self._heap.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the queue statistics in a serializable form."""
+        return self.stats.as_dict(self.depth)
+
+    def _pop(self) -> tuple[str, QueuedWrite] | None:
+        """Remove and return the queued write to send next."""
+        while self._heap:
+            priority, sequence, parameter = heapq.heappop(self._heap)
+            queued = self._pending.get(parameter)
+            # Skip the entries left behind by a priority change
+            if queued is None or (queued.priority, queued.sequence) != (
+                priority,
+                sequence,
+            ):
+                continue
+            del self._pending[parameter]
+            return parameter, queued
+        return None
+
+    async def _async_run(self) -> None:
+        """Write the queued registers until the queue is empty."""
+        while self._pending:
+            if (delay := self._next_write - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+            if (item := self._pop()) is None:
+                return
+            parameter, queued = item
+            now = time.monotonic()
+            self._next_write = now + self._interval
+            wait_ms = (now - queued.enqueued) * 1000
+            self.stats.total_wait_ms += wait_ms
+            self.stats.max_wait_ms = max(self.stats.max_wait_ms, wait_ms)
+
+            self._in_flight = parameter
+            try:
+                result = await self._write(parameter, queued.value)
+            except asyncio.CancelledError:
+                for future in queued.futures:
+                    future.cancel()
+                raise
+            except Exception as error:  # noqa: BLE001 - handed over to every caller
+                self.stats.failed += 1
+                for future in queued.futures:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            finally:
+                self._in_flight = None
+
+            self.stats.written += 1
+            for future in queued.futures:
+                if not future.done():
+                    future.set_result(result)
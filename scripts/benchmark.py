@@ -0,0 +1,222 @@
+"""Offline benchmarks of the integration against the mock diematic daemon.
+
+Needs Home Assistant installed in the environment but no network access:
+
+    python scripts/benchmark.py --latency 0.05 --polls 20 --json before.json
+
+The timer programmer platform depends on a patched Home Assistant, so the
+weekly rewrite drives DiematicBoiler the same way
+DiematicBoilerConfortGroupTimerProgrammer.async_set_value does.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "scripts")]
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.diematic_3_c230_eco.binary_sensor import (  # noqa: E402
+    DiematicBoilerBinarySensor,
+)
+from custom_components.diematic_3_c230_eco.const import (  # noqa: E402
+    CIRCUITS,
+    DAYS_OF_WEEK,
+)
+from custom_components.diematic_3_c230_eco.diematic_bolier import (  # noqa: E402
+    DiematicBoiler,
+)
+from custom_components.diematic_3_c230_eco.number import DiematicNumber  # noqa: E402
+from custom_components.diematic_3_c230_eco.schedule_engine import (  # noqa: E402
+    bitmap_from_variables,
+    changed_slots,
+)
+from custom_components.diematic_3_c230_eco.sensor import (  # noqa: E402
+    DiematicBoilerTempSensor,
+)
+from mock_daemon import PUMPS, MockDaemon  # noqa: E402
+
+HOST = "127.0.0.1"
+NEW_PROGRAM = 0x000FFFF00FFF
+
+
+async def bench_setup(daemon: MockDaemon, boiler: DiematicBoiler) -> dict:
+    """Measure the first refresh plus the descriptor reads of every platform."""
+    daemon.stats.clear()
+    start = time.perf_counter()
+    await boiler.coordinator.async_refresh()
+    # sensor, binary_sensor, number and the scheduler all ask for the catalog
+    catalogs = await asyncio.gather(*(boiler.register_catalog() for _ in range(4)))
+    elapsed = time.perf_counter() - start
+    catalog = catalogs[0]
+    return {
+        "seconds": round(elapsed, 4),
+        "http_calls": dict(daemon.stats),
+        "sensors": len(catalog.temperature_sensors()),
+        "numbers": len(catalog.temperature_numbers()),
+        "day_programs": sum(
+            catalog.has_schedule(circuit, day_of_week)
+            for circuit in CIRCUITS
+            for day_of_week in DAYS_OF_WEEK
+        ),
+    }
+
+
+async def bench_polls(daemon: MockDaemon, boiler: DiematicBoiler, polls: int) -> dict:
+    """Measure coordinator polls with listeners like the enabled entities."""
+    catalog = await boiler.register_catalog()
+    coordinator = boiler.coordinator
+    variables = [register["name"] for register in catalog.temperature_sensors()]
+    variables += [register["name"] for register in catalog.temperature_numbers()]
+    variables += [pump for pump in PUMPS if pump in catalog]
+    variables.append("error")
+    removers = [
+        coordinator.async_add_listener(lambda: None, frozenset({variable}))
+        for variable in variables
+    ]
+
+    daemon.stats.clear()
+    latencies = []
+    for _ in range(polls):
+        start = time.perf_counter()
+        await coordinator.async_refresh()
+        latencies.append(time.perf_counter() - start)
+
+    for remove in removers:
+        remove()
+    return {
+        "polls": polls,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+        "p95_ms": round(
+            sorted(latencies)[max(0, int(len(latencies) * 0.95) - 1)] * 1000, 2
+        ),
+        "http_calls": dict(daemon.stats),
+    }
+
+
+async def bench_weekly_rewrite(daemon: MockDaemon, boiler: DiematicBoiler) -> dict:
+    """Rewrite the weekly program of circuit a and wait for its confirmation."""
+    await boiler.coordinator.async_refresh()
+    variables = boiler.coordinator.data.variables
+    values: dict[str, int] = {}
+    for day_of_week in DAYS_OF_WEEK:
+        varname = f"{day_of_week}_a"
+        current = bitmap_from_variables(varname, variables)
+        values.update(changed_slots(varname, current, NEW_PROGRAM))
+
+    daemon.stats.clear()
+    start = time.perf_counter()
+    written = await boiler.update_boiler_registers(values)
+    write_seconds = time.perf_counter() - start
+    unconfirmed = await boiler.async_wait_confirmation(written)
+    return {
+        "changed_slots": len(values),
+        "write_seconds": round(write_seconds, 4),
+        "confirmed_seconds": round(time.perf_counter() - start, 4),
+        "unconfirmed": len(unconfirmed),
+        "http_calls": dict(daemon.stats),
+        # one write per bit either way, plus one register read per bit when
+        # each write was confirmed on its own
+        "legacy_min_http_calls": 2 * len(values),
+    }
+
+
+async def bench_memory(boiler: DiematicBoiler, unique_id: str) -> dict:
+    """Measure the memory allocated per entity object."""
+    catalog = await boiler.register_catalog()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    entities = [
+        DiematicBoilerTempSensor(
+            "bench", unique_id, boiler, register["name"], register["desc"]
+        )
+        for register in catalog.temperature_sensors()
+    ]
+    entities += [
+        DiematicNumber(
+            "bench",
+            unique_id,
+            boiler,
+            register["name"],
+            register["desc"],
+            float(register["step"]),
+            float(register["max"]),
+            float(register["min"]),
+        )
+        for register in catalog.temperature_numbers()
+    ]
+    entities += [
+        DiematicBoilerBinarySensor(
+            entry_id="bench",
+            unique_id=unique_id,
+            diematic_boiler=boiler,
+            variable=pump,
+            name=pump,
+            icon="mdi:pump",
+        )
+        for pump in PUMPS
+    ]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return {
+        "entities": len(entities),
+        "bytes_per_entity": allocated // max(1, len(entities)),
+        "snapshot_variables": len(boiler.coordinator.data.variables),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Start the mock daemon and a bare Home Assistant, then run every benchmark."""
+    daemon = MockDaemon(
+        latency=args.latency, error_rate=args.error_rate, apply_delay=args.apply_delay
+    )
+    runner = await daemon.async_start(HOST, args.port)
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        try:
+            boiler = DiematicBoiler(
+                hass, host=HOST, port=args.port, tls=False, verify_ssl=False
+            )
+            results = {
+                "setup": await bench_setup(daemon, boiler),
+                "polls": await bench_polls(daemon, boiler, args.polls),
+                "weekly_rewrite": await bench_weekly_rewrite(daemon, boiler),
+                "memory": await bench_memory(boiler, "bench"),
+            }
+            boiler.async_shutdown()
+        finally:
+            await hass.async_stop(force=True)
+            await runner.cleanup()
+    return results
+
+
+def main() -> None:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="0..1")
+    parser.add_argument("--apply-delay", type=float, default=0.0, help="write delay")
+    parser.add_argument("--polls", type=int, default=20)
+    parser.add_argument("--json", type=Path, help="also write the results to a file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""Local stand-in for the diematic daemon HTTP API.
+
+It serves the endpoints used by the integration under the default base path:
+
+- ``GET  /diematic/config``            register descriptor
+- ``GET  /diematic/json``              boiler snapshot, ``?names=a,b`` filters it
+- ``GET  /diematic/parameters/{name}`` single register read
+- ``POST /diematic/parameters/{name}`` single register write
+- ``GET  /diematic/events``            server-sent events with register deltas,
+  and a keepalive comment when nothing changed for ``KEEPALIVE_INTERVAL``
+- ``GET  /stats``                      request counters, ``DELETE /stats`` resets them
+
+With ``--etag`` responses carry an ETag and ``If-None-Match`` gets a 304.
+``--gzip`` and ``--msgpack`` (when msgpack is installed) serve the snapshot
+and descriptor compressed or as msgpack to clients accepting them.
+
+Run it with ``python scripts/mock_daemon.py --port 8080`` and point the
+integration, or ``scripts/benchmark.py``, at it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+import gzip
+import hashlib
+import json
+import random
+from typing import Any
+
+from aiohttp import web
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+BASE_PATH = "/diematic/"
+KEEPALIVE_INTERVAL = 30
+UUID = "00000000-0000-0000-0000-00000000c230"
+CIRCUITS = ("a", "b", "c", "acs")
+DAYS_OF_WEEK = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+PUMPS = (
+    "io_circ_a_pump_on",
+    "io_circ_b_pump_on",
+    "io_circ_c_pump_on",
+    "io_boiler_pump",
+    "io_dhw_pump_on",
+    "io_aux_pump_1_on",
+    "io_aux_pump_2_on",
+    "io_aux_pump_3_on",
+    "io_secondary_pump",
+)
+
+
+def _slot_names(varname: str) -> list[str]:
+    """Return the 48 half hour bits of a day program."""
+    names = []
+    for slot in range(48):
+        start = slot * 30
+        end = (start + 30) % (24 * 60)
+        names.append(
+            f"{varname}_{start // 60:02}{start % 60:02}_{end // 60:02}{end % 60:02}"
+        )
+    return names
+
+
+def build_config() -> list[dict]:
+    """Return a register descriptor shaped like the daemon one."""
+    config: list[dict] = [
+        {"name": "error", "desc": "Boiler error"},
+        {"name": "temp_ext", "desc": "Outside temperature", "unit": "°C", "ha": True},
+        {"name": "temp_boiler", "desc": "Boiler temperature", "unit": "°C", "ha": True},
+    ]
+    for circuit in CIRCUITS:
+        config.append(
+            {
+                "name": f"temp_{circuit}",
+                "desc": f"Temperature {circuit}",
+                "unit": "CelsiusTemperature",
+                "ha": True,
+            }
+        )
+        for mode in ("day", "night"):
+            config.append(
+                {
+                    "name": f"{mode}_temp_{circuit}",
+                    "desc": f"Target {mode} temperature {circuit}",
+                    "unit": "°C",
+                    "ha": True,
+                    "step": 0.5,
+                    "min": 5,
+                    "max": 30,
+                }
+            )
+    config.append({"name": "io", "type": "bits", "bits": list(PUMPS)})
+    for circuit in CIRCUITS:
+        for day_of_week in DAYS_OF_WEEK:
+            names = _slot_names(f"{day_of_week}_{circuit}")
+            for register in range(3):
+                config.append(
+                    {
+                        "name": f"{day_of_week}_{circuit}_{register + 1}",
+                        "type": "bits",
+                        "bits": names[register * 16 : (register + 1) * 16],
+                    }
+                )
+    return config
+
+
+class MockDaemon:
+    """State and request handlers of the fake daemon."""
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        apply_delay: float = 0.0,
+        drift_interval: float = 0.0,
+        seed: int | None = None,
+        etag: bool = False,
+        use_gzip: bool = False,
+        use_msgpack: bool = False,
+    ) -> None:
+        """Initialize the registers with a plausible boiler state."""
+        self.latency = latency
+        self.error_rate = error_rate
+        self.apply_delay = apply_delay
+        self.drift_interval = drift_interval
+        self.etag = etag
+        self.use_gzip = use_gzip
+        self.use_msgpack = use_msgpack and msgpack is not None
+        self.random = random.Random(seed)
+        self.config = build_config()
+        self.variables: dict[str, float | int] = {"error": 0}
+        for register in self.config:
+            if register.get("type") == "bits":
+                for bit in register["bits"]:
+                    self.variables[bit] = 0
+            elif "step" in register:
+                self.variables[register["name"]] = 20.0
+            elif "unit" in register:
+                self.variables[register["name"]] = 45.0
+        for circuit in CIRCUITS:
+            for day_of_week in DAYS_OF_WEEK:
+                for name in _slot_names(f"{day_of_week}_{circuit}")[14:46]:
+                    self.variables[name] = 1
+        self.stats: Counter[str] = Counter()
+        self._subscribers: set[asyncio.Queue] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    def create_app(self) -> web.Application:
+        """Return the aiohttp application serving the daemon API."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get(f"{BASE_PATH}config", self.handle_config)
+        app.router.add_get(f"{BASE_PATH}json", self.handle_json)
+        app.router.add_get(f"{BASE_PATH}parameters/{{name}}", self.handle_read)
+        app.router.add_post(f"{BASE_PATH}parameters/{{name}}", self.handle_write)
+        app.router.add_get(f"{BASE_PATH}events", self.handle_events)
+        app.router.add_get("/stats", self.handle_stats)
+        app.router.add_delete("/stats", self.handle_reset_stats)
+        app.on_startup.append(self._on_startup)
+        app.on_cleanup.append(self._on_cleanup)
+        return app
+
+    async def async_start(self, host: str, port: int) -> web.AppRunner:
+        """Serve the API in the running loop, return the runner to clean it up."""
+        runner = web.AppRunner(self.create_app())
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        """Count requests, add latency, inject errors and answer conditional requests."""
+        if request.path.startswith(BASE_PATH):
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.stats["errors"] += 1
+                raise web.HTTPInternalServerError(text="injected error")
+        response = await handler(request)
+        if isinstance(response, web.Response) and response.body is not None:
+            if self.etag and request.method == "GET" and response.status == 200:
+                etag = f'"{hashlib.sha1(response.body).hexdigest()[:16]}"'
+                response.headers["ETag"] = etag
+                if request.headers.get("If-None-Match") == etag:
+                    self.stats["not_modified"] += 1
+                    return web.Response(status=304, headers={"ETag": etag})
+            self.stats["bytes"] += len(response.body)
+        return response
+
+    async def handle_config(self, request: web.Request) -> web.Response:
+        """Serve the register descriptor."""
+        self.stats["config"] += 1
+        return self._encoded_response(request, self.config)
+
+    async def handle_json(self, request: web.Request) -> web.Response:
+        """Serve the boiler snapshot, filtered when names are given."""
+        if names := request.query.get("names"):
+            self.stats["json_filtered"] += 1
+            wanted = set(names.split(","))
+            variables = {k: v for k, v in self.variables.items() if k in wanted}
+        else:
+            self.stats["json"] += 1
+            variables = self.variables
+        return self._encoded_response(request, {"uuid": UUID, **variables})
+
+    async def handle_read(self, request: web.Request) -> web.Response:
+        """Serve a single register."""
+        self.stats["read"] += 1
+        name = request.match_info["name"]
+        if name not in self.variables:
+            raise web.HTTPNotFound(text=f"unknown register {name}")
+        return web.json_response({"status": "read", "value": self.variables[name]})
+
+    async def handle_write(self, request: web.Request) -> web.Response:
+        """Store a register value, after apply_delay like the daemon write queue."""
+        self.stats["write"] += 1
+        name = request.match_info["name"]
+        if name not in self.variables:
+            raise web.HTTPNotFound(text=f"unknown register {name}")
+        value = json.loads(await request.text())["value"]
+        if self.apply_delay:
+            task = asyncio.get_running_loop().create_task(
+                self._apply_later(name, value)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            self._apply({name: value})
+        return web.json_response({"status": "write"})
+
+    async def handle_events(self, request: web.Request) -> web.StreamResponse:
+        """Stream register deltas as server-sent events."""
+        self.stats["events"] += 1
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.add(queue)
+        try:
+            while True:
+                try:
+                    delta = await asyncio.wait_for(queue.get(), KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    await response.write(b": keepalive\n\n")
+                    continue
+                await response.write(f"data: {json.dumps(delta)}\n\n".encode())
+        finally:
+            self._subscribers.discard(queue)
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        """Return the request counters."""
+        return web.json_response(dict(self.stats))
+
+    async def handle_reset_stats(self, request: web.Request) -> web.Response:
+        """Reset the request counters."""
+        self.stats.clear()
+        return web.json_response({})
+
+    def _encoded_response(self, request: web.Request, data: Any) -> web.Response:
+        """Encode data as msgpack or JSON, gzipped, as the client accepts."""
+        if self.use_msgpack and "application/msgpack" in request.headers.get(
+            "Accept", ""
+        ):
+            body = msgpack.packb(data)
+            content_type = "application/msgpack"
+        else:
+            body = json.dumps(data).encode()
+            content_type = "application/json"
+        headers = {}
+        if self.use_gzip and "gzip" in request.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        return web.Response(body=body, content_type=content_type, headers=headers)
+
+    def _apply(self, delta: dict) -> None:
+        """Change registers and notify the event subscribers."""
+        self.variables.update(delta)
+        for queue in self._subscribers:
+            queue.put_nowait(delta)
+
+    async def _apply_later(self, name: str, value: float | int) -> None:
+        """Apply a write once the simulated bus cycle is over."""
+        await asyncio.sleep(self.apply_delay)
+        self._apply({name: value})
+
+    async def _drift(self) -> None:
+        """Move temperatures and toggle a pump now and then."""
+        while True:
+            await asyncio.sleep(self.drift_interval)
+            delta: dict[str, float | int] = {
+                f"temp_{circuit}": round(
+                    self.variables[f"temp_{circuit}"] + self.random.uniform(-0.5, 0.5),
+                    1,
+                )
+                for circuit in CIRCUITS
+            }
+            if self.random.random() < 0.2:
+                pump = self.random.choice(PUMPS)
+                delta[pump] = 1 - self.variables[pump]
+            self._apply(delta)
+
+    async def _on_startup(self, app: web.Application) -> None:
+        """Start the simulated boiler activity."""
+        if self.drift_interval:
+            task = asyncio.get_running_loop().create_task(self._drift())
+            self._tasks.add(task)
+
+    async def _on_cleanup(self, app: web.Application) -> None:
+        """Stop the pending background work."""
+        for task in self._tasks:
+            task.cancel()
+
+
+def main() -> None:
+    """Run the mock daemon from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="0..1")
+    parser.add_argument("--apply-delay", type=float, default=0.0, help="write delay")
+    parser.add_argument("--drift", type=float, default=0.0, help="seconds between changes")
+    parser.add_argument("--etag", action="store_true", help="answer If-None-Match")
+    parser.add_argument("--gzip", action="store_true", help="compress responses")
+    parser.add_argument("--msgpack", action="store_true", help="offer msgpack")
+    args = parser.parse_args()
+
+    daemon = MockDaemon(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        apply_delay=args.apply_delay,
+        drift_interval=args.drift,
+        etag=args.etag,
+        use_gzip=args.gzip,
+        use_msgpack=args.msgpack,
+    )
+    web.run_app(daemon.create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Local Modbus RTU over TCP simulator of the boiler.
+
+It answers read holding registers (0x03) and write multiple registers (0x10)
+requests for the registers of the mock daemon, so the Modbus transport can be
+tried without a boiler:
+
+    python scripts/modbus_simulator.py --port 5020 --write-map /tmp/diematic.yaml
+
+then configure the integration with the Modbus transport, port 5020, unit 10
+and the register map written above.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+import struct
+
+import yaml
+
+from mock_daemon import MockDaemon, build_config
+
+UNIT = 10
+ONE_DECIMAL_TYPE = "DiematicOneDecimal"
+
+
+def crc16(frame: bytes) -> int:
+    """Return the Modbus RTU CRC of a frame."""
+    crc = 0xFFFF
+    for byte in frame:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+def build_register_map() -> list[dict]:
+    """Return the mock daemon configuration with a Modbus address per register."""
+    registers = []
+    for address, register in enumerate(build_config(), start=1):
+        register = {"id": address, **register}
+        if "unit" in register:
+            register["type"] = ONE_DECIMAL_TYPE
+        registers.append(register)
+    return registers
+
+
+class ModbusSimulator:
+    """Holding registers of a simulated boiler and the RTU request handler."""
+
+    def __init__(self, unit: int = UNIT) -> None:
+        """Initialize the registers from the mock daemon state."""
+        self.unit = unit
+        self.registers = build_register_map()
+        self.memory: dict[int, int] = {}
+        self.requests = 0
+        variables = MockDaemon().variables
+        for register in self.registers:
+            if register.get("type") == "bits":
+                raw = 0
+                for index, bit in enumerate(register["bits"]):
+                    if variables.get(bit):
+                        raw |= 1 << (15 - index)
+            else:
+                value = variables.get(register["name"], 0)
+                if register.get("type") == ONE_DECIMAL_TYPE:
+                    value *= 10
+                raw = round(abs(value)) | (0x8000 if value < 0 else 0)
+            self.memory[register["id"]] = raw
+
+    def handle(self, frame: bytes) -> bytes | None:
+        """Return the response to a request frame, None when it is not for us."""
+        if len(frame) < 4 or frame[0] != self.unit:
+            return None
+        if struct.unpack("<H", frame[-2:])[0] != crc16(frame[:-2]):
+            return None
+        self.requests += 1
+        function = frame[1]
+        if function == 0x03:
+            address, count = struct.unpack(">HH", frame[2:6])
+            values = [
+                self.memory.get(address + offset, 0xFFFF) for offset in range(count)
+            ]
+            body = bytes([self.unit, function, 2 * count]) + struct.pack(
+                f">{count}H", *values
+            )
+        elif function == 0x10:
+            address, count = struct.unpack(">HH", frame[2:6])
+            values = struct.unpack(f">{count}H", frame[7 : 7 + 2 * count])
+            for offset, value in enumerate(values):
+                self.memory[address + offset] = value
+            body = bytes([self.unit, function]) + struct.pack(">HH", address, count)
+        else:
+            body = bytes([self.unit, function | 0x80, 0x01])
+        return body + struct.pack("<H", crc16(body))
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer the frames of one gateway connection."""
+        try:
+            while True:
+                header = await reader.readexactly(2)
+                if header[1] == 0x10:
+                    fixed = await reader.readexactly(5)
+                    frame = header + fixed + await reader.readexactly(fixed[4] + 2)
+                else:
+                    frame = header + await reader.readexactly(6)
+                if (response := self.handle(frame)) is not None:
+                    writer.write(response)
+                    await writer.drain()
+        except asyncio.IncompleteReadError:
+            pass
+        finally:
+            writer.close()
+
+    async def async_start(self, host: str, port: int) -> asyncio.Server:
+        """Serve the simulated gateway in the running loop."""
+        return await asyncio.start_server(self.handle_client, host, port)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Run the simulator until interrupted."""
+    simulator = ModbusSimulator(args.unit)
+    if args.write_map:
+        args.write_map.write_text(
+            yaml.safe_dump({"registers": simulator.registers}, allow_unicode=True)
+        )
+    server = await simulator.async_start(args.host, args.port)
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> None:
+    """Run the simulator from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument("--unit", type=int, default=UNIT)
+    parser.add_argument("--write-map", type=Path, help="write the register map here")
+    asyncio.run(_serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Tests for the aggregators of boiler variables."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from custom_components.diematic_3_c230_eco.aggregators import DailyStatistics, OnTime
+
+
+def test_daily_statistics_next_day_keeps_yesterday() -> None:
+    """The statistics of the previous day become yesterday's."""
+    statistics = DailyStatistics()
+    statistics.update(10, datetime(2026, 10, 17, 12, tzinfo=timezone.utc))
+    statistics.update(30, datetime(2026, 10, 17, 18, tzinfo=timezone.utc))
+    statistics.update(20, datetime(2026, 10, 18, 6, tzinfo=timezone.utc))
+
+    assert statistics.day == "2026-10-18"
+    assert statistics.yesterday == {"minimum": 10, "maximum": 30, "mean": 20}
+
+
+def test_daily_statistics_multi_day_gap_drops_yesterday() -> None:
+    """A saved day older than yesterday is not reported as yesterday."""
+    statistics = DailyStatistics(
+        minimum=10, maximum=30, weighted_sum=20.0, weighted_s=1.0, day="2026-10-10"
+    )
+    statistics.update(15, datetime(2026, 10, 18, 6, tzinfo=timezone.utc))
+
+    assert statistics.day == "2026-10-18"
+    assert statistics.yesterday is None
+    assert (statistics.minimum, statistics.maximum) == (15, 15)
+
+
+def test_on_time_multi_day_gap_resets_yesterday() -> None:
+    """A saved day older than yesterday gives no runtime yesterday."""
+    on_time = OnTime(today_s=3600.0, day="2026-10-10")
+    on_time.update(True, datetime(2026, 10, 18, 6, tzinfo=timezone.utc))
+
+    assert on_time.day == "2026-10-18"
+    assert on_time.yesterday_s == 0.0